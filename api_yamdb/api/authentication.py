@@ -0,0 +1,85 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+User = get_user_model()
+
+CLAIM_FIELDS = ('username', 'role', 'is_superuser')
+USER_STATE_KEY = 'auth-user-state:{}'
+USER_STATE_TIMEOUT = 5 * 60
+
+
+class UserClaimsRefreshToken(RefreshToken):
+    """Токен, в который записаны имя, роль и is_superuser пользователя."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for field in CLAIM_FIELDS:
+            token[field] = getattr(user, field)
+        return token
+
+
+def get_user_state(user):
+    return {
+        'username': user.username,
+        'role': user.role,
+        'is_superuser': user.is_superuser,
+        'is_active': user.is_active,
+    }
+
+
+def remember_user_state(user):
+    cache.set(USER_STATE_KEY.format(user.pk), get_user_state(user),
+              USER_STATE_TIMEOUT)
+
+
+@receiver(post_save, sender=User)
+def update_user_state(sender, instance, **kwargs):
+    remember_user_state(instance)
+
+
+@receiver(post_delete, sender=User)
+def forget_user_state(sender, instance, **kwargs):
+    cache.delete(USER_STATE_KEY.format(instance.pk))
+
+
+def token_user(user_id, state):
+    """Экземпляр пользователя из данных токена без запроса к БД."""
+    values = {'id': user_id, **state}
+    field_names = [
+        field.attname for field in User._meta.concrete_fields
+        if field.attname in values
+    ]
+    return User.from_db(DEFAULT_DB_ALIAS, field_names,
+                        [values[name] for name in field_names])
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """Аутентификация по JWT без чтения пользователя из БД."""
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        claims = {
+            field: validated_token.get(field) for field in CLAIM_FIELDS
+        }
+        state = cache.get(USER_STATE_KEY.format(user_id))
+        if user_id is None or state is None:
+            return self.load_user(validated_token)
+        if not state['is_active']:
+            raise AuthenticationFailed('User is inactive',
+                                       code='user_inactive')
+        if any(state[field] != claims[field] for field in CLAIM_FIELDS):
+            return self.load_user(validated_token)
+        return token_user(user_id, state)
+
+    def load_user(self, validated_token):
+        user = super().get_user(validated_token)
+        remember_user_state(user)
+        return user
@@ -0,0 +1,248 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+from reviews.deletion import is_deleted
+from reviews.models import Categories, Comment, Genre, Review, Title
+
+VERSION_KEY = 'api-cache-version:{}'
+MODIFIED_KEY = '{}:modified'
+RESPONSE_KEY = 'api-response:{}'
+
+
+def version_key(model, pk=None):
+    label = model._meta.label_lower
+    if pk is not None:
+        label = f'{label}:{pk}'
+    return VERSION_KEY.format(label)
+
+
+def get_versions(keys):
+    """Текущие версии ключей; потерянная версия заводится заново."""
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, int(time.time() * 1000), None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def get_last_modified(keys):
+    """Время последнего изменения ключей или None, если оно неизвестно."""
+    modified_keys = [MODIFIED_KEY.format(key) for key in keys]
+    modified = cache.get_many(modified_keys)
+    if not modified_keys or len(modified) < len(modified_keys):
+        return None
+    return max(modified.values())
+
+
+def incr_version(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        get_versions([key])
+    cache.set(MODIFIED_KEY.format(key), int(time.time()), None)
+
+
+def bump_version(model, pk=None):
+    """Увеличивает версию сразу и ещё раз после COMMIT."""
+    key = version_key(model, pk)
+    incr_version(key)
+    transaction.on_commit(lambda: incr_version(key))
+
+
+def invalidate_bulk(changed, batch_size=1000):
+    """Сбрасывает версии после вставки в обход сигналов."""
+    for model in (Categories, Genre, Title, Review, Comment):
+        bump_version(model)
+    for model, pks in changed.items():
+        keys = [version_key(model, pk) for pk in pks]
+        for start in range(0, len(keys), batch_size):
+            batch = keys[start:start + batch_size]
+            # Удалённую версию get_versions заведёт заново от текущего
+            # времени, как увеличенную.
+            cache.delete_many(
+                batch + [MODIFIED_KEY.format(key) for key in batch]
+            )
+
+
+def get_request_digest(request, *parts):
+    query = '&'.join(sorted(
+        f'{name}={value}'
+        for name, values in request.query_params.lists()
+        for value in values
+    ))
+    return hashlib.md5(
+        '|'.join((request.path, query) + parts).encode()
+    ).hexdigest()
+
+
+class ModelVersionsMixin:
+    """Версии моделей, от которых зависит ответ list или retrieve."""
+    cache_models = ()
+    cache_detail_models = ()
+
+    def get_cache_version_keys(self):
+        lookup = self.kwargs.get(self.lookup_url_kwarg or self.lookup_field)
+        if lookup is None:
+            return [version_key(model) for model in self.cache_models]
+        return [
+            version_key(model) for model in self.cache_detail_models
+        ] + [version_key(self.queryset.model, lookup)]
+
+    def get_cache_versions(self):
+        if not hasattr(self, '_cache_versions'):
+            self._cache_versions = ','.join(
+                map(str, get_versions(self.get_cache_version_keys()))
+            )
+        return self._cache_versions
+
+
+class CachedResponseMixin(ModelVersionsMixin):
+    """Кеширует ответы list и retrieve на анонимные GET-запросы."""
+    cache_row_models = ()
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(super().list, request,
+                                        *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(super().retrieve, request,
+                                        *args, **kwargs)
+
+    def get_cache_row_models(self):
+        return () if self.detail else self.cache_row_models
+
+    def get_response_cache_key(self, request):
+        skipped = {version_key(model) for model in self.get_cache_row_models()}
+        keys = [key for key in self.get_cache_version_keys()
+                if key not in skipped]
+        digest = get_request_digest(
+            request,
+            ','.join(permission.__qualname__
+                     for permission in self.permission_classes),
+            ','.join(map(str, get_versions(keys))),
+        )
+        return RESPONSE_KEY.format(digest)
+
+    def get_page_row_keys(self):
+        """Ключи версий записей текущей страницы или None без страницы."""
+        page = getattr(self.paginator, 'page', None)
+        if page is None:
+            return None
+        model = self.queryset.model
+        pk = model._meta.pk.name
+        return [
+            version_key(model, row[pk] if isinstance(row, dict) else row.pk)
+            for row in page.object_list
+        ]
+
+    def get_cached_response(self, handler, request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return handler(request, *args, **kwargs)
+        key = self.get_response_cache_key(request)
+        cached = cache.get(key)
+        if cached is not None:
+            rows, data = cached
+            if not rows or cache.get_many(list(rows)) == rows:
+                return Response(data)
+        guard_keys = [version_key(model)
+                      for model in self.get_cache_row_models()]
+        guard = get_versions(guard_keys)
+        response = handler(request, *args, **kwargs)
+        if response.status_code != 200:
+            return response
+        rows = {}
+        if guard_keys:
+            row_keys = self.get_page_row_keys()
+            # Изменение во время выборки могло не попасть в версии записей,
+            # прочитанные после неё: такой ответ не сохраняется.
+            if row_keys is None or get_versions(guard_keys) != guard:
+                return response
+            rows = dict(zip(row_keys, get_versions(row_keys)))
+        cache.set(key, (rows, response.data), settings.API_CACHE_TIMEOUT)
+        return response
+
+
+class ConditionalGetMixin(ModelVersionsMixin):
+    """Слабый ETag и Last-Modified для list и retrieve."""
+
+    def list(self, request, *args, **kwargs):
+        return self.get_conditional_response(super().list, request,
+                                             *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_conditional_response(super().retrieve, request,
+                                             *args, **kwargs)
+
+    def get_conditional_response(self, handler, request, *args, **kwargs):
+        etag = 'W/"{}"'.format(
+            get_request_digest(request, self.get_cache_versions())
+        )
+        last_modified = get_last_modified(self.get_cache_version_keys())
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+
+@receiver((post_save, post_delete), sender=Title)
+def invalidate_title(sender, instance, **kwargs):
+    bump_version(Title)
+    bump_version(Title, instance.pk)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_title_genres(sender, instance, action, reverse, **kwargs):
+    if not action.startswith('post_'):
+        return
+    bump_version(Title)
+    if not reverse:
+        bump_version(Title, instance.pk)
+
+
+@receiver((post_save, post_delete), sender=Review)
+def invalidate_review(sender, instance, **kwargs):
+    bump_version(Review)
+    bump_version(Review, instance.pk)
+    # Версию удаляемого вместе с отзывом произведения сдвинет его сигнал.
+    if not is_deleted(Title, instance.title_id):
+        bump_version(Title, instance.title_id)
+
+
+@receiver((post_save, post_delete), sender=Comment)
+def invalidate_comment(sender, instance, **kwargs):
+    bump_version(Comment, instance.pk)
+    if is_deleted(Review, instance.review_id):
+        return
+    bump_version(Review, instance.review_id)
+    # Список отзывов произведения показывает comments_count.
+    if Comment.review.is_cached(instance):
+        title_id = instance.review.title_id
+    else:
+        title_id = Review.objects.filter(
+            pk=instance.review_id
+        ).values_list('title_id', flat=True).first()
+    if title_id is not None:
+        bump_version(Title, title_id)
+
+
+@receiver((post_save, post_delete), sender=Genre)
+@receiver((post_save, post_delete), sender=Categories)
+def invalidate_model(sender, **kwargs):
+    bump_version(sender)
@@ -0,0 +1,198 @@
+"""Быстрый list: ответ собирается из строк values() без моделей."""
+from collections import OrderedDict, defaultdict
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.response import Response
+
+from .lookups import get_table_cache
+from .metrics import measure
+
+
+class ValuesPlan:
+    """Как собрать ответ сериализатора из строк values()."""
+
+    def __init__(self, model, fields):
+        self.model = model
+        self.pk = model._meta.pk.name
+        self.columns = [self.pk]
+        self.steps = []
+        self.many = []
+        for name, field in fields.items():
+            if not self.add(name, field):
+                raise ValueError(f'Поле {name} не читается через values()')
+        self.columns = list(dict.fromkeys(self.columns))
+
+    def add(self, name, field):
+        source = field.source
+        if source == '*' or '.' in source:
+            return False
+        try:
+            model_field = self.model._meta.get_field(source)
+        except FieldDoesNotExist:
+            return False
+        if isinstance(field, serializers.ListSerializer):
+            if not model_field.many_to_many or not isinstance(
+                    field.child, serializers.Serializer):
+                return False
+            self.many.append((name, model_field, field.child))
+            self.steps.append((name, 'many', None))
+            return True
+        if model_field.is_relation:
+            table = get_table_cache(model_field.related_model)
+            if table is not None and isinstance(field,
+                                                serializers.Serializer):
+                self.columns.append(model_field.attname)
+                self.steps.append(
+                    (name, 'cached', (model_field.attname, table, field))
+                )
+                return True
+            if isinstance(field, serializers.Serializer):
+                children = [
+                    (child.field_name, f'{source}__{child.source}', child)
+                    for child in field.fields.values()
+                ]
+                self.columns.append(source)
+                self.columns.extend(column for _, column, _ in children)
+                self.steps.append((name, 'nested', (source, children)))
+                return True
+            if isinstance(field, serializers.SlugRelatedField):
+                column = f'{source}__{field.slug_field}'
+                self.columns.append(column)
+                self.steps.append((name, 'raw', column))
+                return True
+            return False
+        self.columns.append(source)
+        self.steps.append((name, 'field', (source, field)))
+        return True
+
+    def fetch_many(self, rows, cached):
+        """Значения многие-ко-многим для страницы одним запросом на поле."""
+        ids = [row[self.pk] for row in rows]
+        result = {}
+        for name, model_field, serializer in self.many:
+            table = get_table_cache(model_field.related_model)
+            if table is not None:
+                result[name] = self.fetch_cached_many(model_field, table,
+                                                      serializer, ids, cached)
+                continue
+            children = serializer.fields
+            related = model_field.related_model
+            backward = model_field.related_query_name()
+            values = related.objects.filter(
+                **{f'{backward}__in': ids}
+            ).values(backward, *(child.source for child in children.values()))
+            grouped = defaultdict(list)
+            for value in values:
+                grouped[value[backward]].append(OrderedDict(
+                    (child.field_name, represent(child, value[child.source]))
+                    for child in children.values()
+                ))
+            result[name] = grouped
+        return result
+
+    def fetch_cached_many(self, model_field, table, serializer, ids, cached):
+        """Связи из промежуточной таблицы, объекты из копии справочника."""
+        through = model_field.remote_field.through._meta
+        source = through.get_field(model_field.m2m_field_name()).attname
+        target = through.get_field(
+            model_field.m2m_reverse_field_name()
+        ).attname
+        links = through.model.objects.filter(
+            **{f'{source}__in': ids}
+        ).values_list(source, target)
+        grouped = defaultdict(list)
+        for owner, pk in links:
+            grouped[owner].append(pk)
+        position = cached.get_snapshot(table).position
+        return {
+            owner: [
+                cached.represent(table, serializer, pk)
+                for pk in sorted(pks, key=lambda pk: position.get(pk, -1))
+            ]
+            for owner, pks in grouped.items()
+        }
+
+    def represent(self, rows):
+        cached = CachedRepresentations()
+        many = self.fetch_many(rows, cached) if self.many else {}
+        data = []
+        for row in rows:
+            item = OrderedDict()
+            for name, kind, spec in self.steps:
+                if kind == 'field':
+                    item[name] = represent(spec[1], row[spec[0]])
+                elif kind == 'raw':
+                    item[name] = row[spec]
+                elif kind == 'cached':
+                    column, table, serializer = spec
+                    item[name] = None if row[column] is None else (
+                        cached.represent(table, serializer, row[column])
+                    )
+                elif kind == 'nested':
+                    source, children = spec
+                    item[name] = None if row[source] is None else OrderedDict(
+                        (child_name, represent(child, row[column]))
+                        for child_name, column, child in children
+                    )
+                else:
+                    item[name] = many[name].get(row[self.pk], [])
+            data.append(item)
+        return data
+
+
+def represent(field, value):
+    return None if value is None else field.to_representation(value)
+
+
+class CachedRepresentations:
+    """Представления объектов справочников в пределах одной страницы."""
+
+    def __init__(self):
+        self.snapshots = {}
+        self.data = {}
+
+    def represent(self, table, serializer, pk):
+        key = (table.model, pk)
+        if key not in self.data:
+            self.data[key] = serializer.to_representation(
+                self.get_object(table, pk)
+            )
+        return self.data[key]
+
+    def get_snapshot(self, table):
+        if table not in self.snapshots:
+            self.snapshots[table] = table.get()
+        return self.snapshots[table]
+
+    def get_object(self, table, pk):
+        obj = self.get_snapshot(table).by_pk.get(pk)
+        if obj is None:
+            # Запись появилась позже копии, а версия ещё не увеличена
+            # после COMMIT: перечитываем справочник.
+            table.clear()
+            self.snapshots[table] = table.get()
+            obj = self.snapshots[table].by_pk[pk]
+        return obj
+
+
+class FastListMixin:
+    """list через values() для вьюсетов только с простыми полями."""
+    fast_list = True
+
+    def list(self, request, *args, **kwargs):
+        if not self.fast_list:
+            return super().list(request, *args, **kwargs)
+        serializer = self.get_serializer()
+        try:
+            plan = ValuesPlan(serializer.Meta.model, serializer.fields)
+        except ValueError:
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = queryset.prefetch_related(None).values(*plan.columns)
+        page = self.paginate_queryset(rows)
+        with measure(request, 'serializer'):
+            data = plan.represent(list(rows) if page is None else page)
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
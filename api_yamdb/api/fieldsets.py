@@ -0,0 +1,102 @@
+"""
+Выборочные поля ответа: ?fields=id,name оставляет только перечисленные
+поля, ?omit=genre убирает указанные. Сериализатор отбрасывает лишние
+поля, а вьюсет по оставшимся полям сужает запрос: .only() по нужным
+колонкам, select_related и prefetch_related только для связей,
+которые попадут в ответ.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_PARAM = 'fields'
+OMIT_PARAM = 'omit'
+
+
+def split_param(request, name):
+    value = request.query_params.get(name, '')
+    return {item.strip() for item in value.split(',') if item.strip()}
+
+
+def sparse_fields_requested(request):
+    return request is not None and request.method in SAFE_METHODS and (
+        split_param(request, FIELDS_PARAM) or split_param(request, OMIT_PARAM)
+    )
+
+
+class SparseFieldsSerializerMixin:
+    """
+    Убирает из сериализатора поля, не выбранные параметрами fields и omit.
+    Действует только на чтение, чтобы не терять поля при записи.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if not sparse_fields_requested(request):
+            return
+        fields = split_param(request, FIELDS_PARAM)
+        omit = split_param(request, OMIT_PARAM)
+        unknown = (fields | omit) - set(self.fields)
+        if unknown:
+            raise serializers.ValidationError({
+                FIELDS_PARAM: 'Неизвестные поля: {}'.format(
+                    ', '.join(sorted(unknown))
+                )
+            })
+        for name in list(self.fields):
+            if (fields and name not in fields) or name in omit:
+                self.fields.pop(name)
+
+
+def related_columns(field):
+    """Поля связанной модели, которые читает поле сериализатора."""
+    if isinstance(field, serializers.SlugRelatedField):
+        return [field.slug_field]
+    if isinstance(field, serializers.BaseSerializer):
+        return [child.source for child in field.fields.values()]
+    return None
+
+
+def prune_queryset(queryset, fields):
+    """
+    Сужает queryset до колонок и связей, которые читают поля
+    сериализатора. Если источник поля не удаётся сопоставить с моделью,
+    queryset возвращается без изменений.
+    """
+    opts = queryset.model._meta
+    only = {opts.pk.name}
+    select, prefetch = [], []
+    for field in fields.values():
+        name = field.source.split('.')[0]
+        try:
+            model_field = opts.get_field(name)
+        except FieldDoesNotExist:
+            return queryset
+        if model_field.many_to_many or model_field.one_to_many:
+            prefetch.append(name)
+            continue
+        only.add(name)
+        columns = related_columns(field) if model_field.is_relation else None
+        if columns:
+            select.append(name)
+            only.update(f'{name}__{column}' for column in columns)
+    queryset = queryset.select_related(None).prefetch_related(None)
+    if select:
+        queryset = queryset.select_related(*select)
+    return queryset.prefetch_related(*prefetch).only(*only)
+
+
+class SparseFieldsViewMixin:
+    """
+    Передаёт выбор полей из запроса в queryset списка и объекта.
+    Дополнительные действия чтения перечисляются в sparse_actions.
+    """
+    sparse_actions = ('list', 'retrieve')
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action not in self.sparse_actions or (
+                not sparse_fields_requested(self.request)):
+            return queryset
+        return prune_queryset(queryset, self.get_serializer().fields)
@@ -1,6 +1,8 @@
 import django_filters
+from rest_framework.filters import BaseFilterBackend
 
 from reviews.models import Title
+from reviews.search import search_titles
 
 
 class TitleGenreFilter(django_filters.FilterSet):
@@ -12,3 +14,16 @@ class TitleGenreFilter(django_filters.FilterSet):
     class Meta:
         model = Title
         fields = ('name', 'year', 'category', 'genre')
+
+
+class TitleSearchFilter(BaseFilterBackend):
+    """
+    Поиск произведений по названию с ранжированием: ?search=<запрос>.
+    """
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '').strip()
+        if not query:
+            return queryset
+        return search_titles(queryset, query)
@@ -0,0 +1,75 @@
+"""Копии маленьких справочников в памяти процесса."""
+import threading
+
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework import serializers
+
+from reviews.models import Categories, Genre
+
+from .cache import get_versions, version_key
+
+
+class TableSnapshot:
+    """Строки таблицы на одну версию: по первичному ключу и по slug."""
+
+    def __init__(self, version, objects):
+        self.version = version
+        self.by_pk = {obj.pk: obj for obj in objects}
+        self.by_slug = {obj.slug: obj for obj in objects}
+        # Место в порядке модели по умолчанию, чтобы сортировать
+        # связанные объекты так же, как запрос к таблице.
+        self.position = {obj.pk: index for index, obj in enumerate(objects)}
+
+
+class LocalTableCache:
+    """Копия таблицы model, перечитываемая при смене версии модели."""
+
+    def __init__(self, model):
+        self.model = model
+        self.key = version_key(model)
+        self.lock = threading.Lock()
+        self.snapshot = None
+
+    def get(self):
+        version = get_versions([self.key])[0]
+        snapshot = self.snapshot
+        if snapshot is not None and snapshot.version == version:
+            return snapshot
+        with self.lock:
+            if self.snapshot is None or self.snapshot.version != version:
+                # Копия читается с основной базы: реплика могла ещё
+                # не получить изменение, которое увеличило версию.
+                objects = list(self.model._default_manager.db_manager(
+                    DEFAULT_DB_ALIAS
+                ).all())
+                self.snapshot = TableSnapshot(version, objects)
+            return self.snapshot
+
+    def clear(self):
+        self.snapshot = None
+
+
+TABLE_CACHES = {
+    Categories: LocalTableCache(Categories),
+    Genre: LocalTableCache(Genre),
+}
+
+
+def get_table_cache(model):
+    return TABLE_CACHES.get(model)
+
+
+class CachedSlugRelatedField(serializers.SlugRelatedField):
+    """SlugRelatedField, который ищет объект по slug в копии таблицы."""
+
+    def to_internal_value(self, data):
+        if not hasattr(self, '_snapshot'):
+            model = self.get_queryset().model
+            self._snapshot = TABLE_CACHES[model].get()
+        if isinstance(data, bool) or not isinstance(data, (str, int)):
+            self.fail('invalid')
+        try:
+            return self._snapshot.by_slug[str(data)]
+        except KeyError:
+            self.fail('does_not_exist', slug_name=self.slug_field,
+                      value=data)
@@ -0,0 +1,249 @@
+"""
+Замеры времени обработки запросов.
+
+ServerTimingMiddleware заводит на запросе RequestMetrics и считает
+запросы к БД и общее время, InstrumentedViewMixin добавляет время
+аутентификации, проверки прав, ограничений частоты, сериализации и
+остальной работы вьюхи.
+Итоги копятся в гистограммах процесса и отдаются на /metrics в текстовом
+формате Prometheus; при SERVER_TIMING_HEADER те же замеры уходят клиенту
+в заголовке Server-Timing.
+"""
+import threading
+import time
+from collections import defaultdict
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+PHASE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+PHASES = ('total', 'db', 'auth', 'permissions', 'throttle', 'serializer',
+          'view')
+
+
+class RequestMetrics:
+    """Замеры одного запроса: длительности фаз в секундах и число SQL."""
+
+    def __init__(self):
+        self.endpoint = None
+        self.queries = 0
+        self.durations = defaultdict(float)
+
+    def add(self, phase, seconds):
+        self.durations[phase] += seconds
+
+    def measure(self, phase):
+        return PhaseTimer(self, phase)
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.add('db', time.perf_counter() - started)
+
+    def server_timing(self):
+        items = []
+        for phase in PHASES:
+            if phase not in self.durations:
+                continue
+            item = f'{phase};dur={self.durations[phase] * 1000:.2f}'
+            if phase == 'db':
+                item += f';desc="{self.queries} queries"'
+            items.append(item)
+        return ', '.join(items)
+
+
+class PhaseTimer:
+    """Время фазы без учёта запросов к БД, которые идут в фазу db."""
+
+    def __init__(self, metrics, phase):
+        self.metrics = metrics
+        self.phase = phase
+
+    def __enter__(self):
+        self.db_before = self.metrics.durations['db']
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        elapsed = time.perf_counter() - self.started
+        db = self.metrics.durations['db'] - self.db_before
+        self.metrics.add(self.phase, max(elapsed - db, 0))
+
+
+def measure(request, phase):
+    """Таймер фазы запроса; без ServerTimingMiddleware замер никуда не идёт."""
+    metrics = getattr(request, 'metrics', None) or RequestMetrics()
+    return metrics.measure(phase)
+
+
+class Histogram:
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.sum += value
+        self.count += 1
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+
+
+class MetricsRegistry:
+    """
+    Гистограммы фаз и числа запросов к БД по эндпоинтам.
+    Хранятся в памяти процесса: каждый воркер gunicorn отдаёт свои.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        self.phases = {}
+        self.queries = {}
+
+    def observe(self, metrics):
+        endpoint = metrics.endpoint or 'unmatched'
+        with self.lock:
+            for phase, seconds in metrics.durations.items():
+                self.phases.setdefault(
+                    (endpoint, phase), Histogram(PHASE_BUCKETS)
+                ).observe(seconds)
+            self.queries.setdefault(
+                endpoint, Histogram(QUERY_BUCKETS)
+            ).observe(metrics.queries)
+
+    def render(self):
+        lines = [
+            '# HELP yamdb_request_phase_seconds '
+            'Request time by endpoint and phase.',
+            '# TYPE yamdb_request_phase_seconds histogram',
+        ]
+        with self.lock:
+            for (endpoint, phase), histogram in sorted(self.phases.items()):
+                lines.extend(_render_histogram(
+                    'yamdb_request_phase_seconds',
+                    f'endpoint="{endpoint}",phase="{phase}"',
+                    histogram
+                ))
+            lines.extend((
+                '# HELP yamdb_request_db_queries '
+                'Database queries per request by endpoint.',
+                '# TYPE yamdb_request_db_queries histogram',
+            ))
+            for endpoint, histogram in sorted(self.queries.items()):
+                lines.extend(_render_histogram(
+                    'yamdb_request_db_queries',
+                    f'endpoint="{endpoint}"',
+                    histogram
+                ))
+        return '\n'.join(lines) + '\n'
+
+
+def _render_histogram(name, labels, histogram):
+    for bound, count in zip(histogram.buckets, histogram.counts):
+        yield f'{name}_bucket{{{labels},le="{bound}"}} {count}'
+    yield f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}'
+    yield f'{name}_sum{{{labels}}} {histogram.sum}'
+    yield f'{name}_count{{{labels}}} {histogram.count}'
+
+
+registry = MetricsRegistry()
+
+
+class ServerTimingMiddleware:
+    """
+    Считает время и запросы к БД для каждого запроса, копит их
+    в registry и при SERVER_TIMING_HEADER добавляет заголовок
+    Server-Timing.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = request.metrics = RequestMetrics()
+        started = time.perf_counter()
+        # Запросы к репликам считаются вместе с запросами к основной базе.
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(
+                    metrics.execute_wrapper
+                ))
+            response = self.get_response(request)
+        metrics.add('total', time.perf_counter() - started)
+        if metrics.endpoint is None and request.resolver_match:
+            metrics.endpoint = request.resolver_match.view_name
+        registry.observe(metrics)
+        if settings.SERVER_TIMING_HEADER:
+            response['Server-Timing'] = metrics.server_timing()
+        return response
+
+
+class InstrumentedViewMixin:
+    """
+    Разбивает время обработки во вьюсете на фазы: аутентификация,
+    права, ограничение частоты, serializer - to_representation
+    сериализатора и view - всё остальное время вьюхи за вычетом БД:
+    фильтрация, построение запросов, пагинация, создание объектов.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        metrics = getattr(request, 'metrics', None)
+        if metrics is None:
+            return super().dispatch(request, *args, **kwargs)
+        durations_before = dict(metrics.durations)
+        started = time.perf_counter()
+        response = super().dispatch(request, *args, **kwargs)
+        elapsed = time.perf_counter() - started
+        spent = sum(
+            metrics.durations[phase] - durations_before.get(phase, 0)
+            for phase in ('db', 'auth', 'permissions', 'throttle',
+                          'serializer')
+        )
+        metrics.add('view', max(elapsed - spent, 0))
+        basename = getattr(self, 'basename', None)
+        if basename:
+            metrics.endpoint = f'{basename}-{self.action or "unknown"}'
+        return response
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        to_representation = serializer.to_representation
+
+        def measured(instance):
+            with self._measure('serializer'):
+                return to_representation(instance)
+
+        # Замеряется только корневой сериализатор: вложенные и элементы
+        # списка вызываются из него и уже входят в его время.
+        serializer.to_representation = measured
+        return serializer
+
+    def perform_authentication(self, request):
+        with self._measure('auth'):
+            super().perform_authentication(request)
+
+    def check_permissions(self, request):
+        with self._measure('permissions'):
+            super().check_permissions(request)
+
+    def check_object_permissions(self, request, obj):
+        with self._measure('permissions'):
+            super().check_object_permissions(request, obj)
+
+    def check_throttles(self, request):
+        with self._measure('throttle'):
+            super().check_throttles(request)
+
+    def _measure(self, phase):
+        return measure(self.request, phase)
@@ -0,0 +1,158 @@
+"""Пагинация API."""
+import json
+from collections import OrderedDict
+from functools import partial
+
+from django.conf import settings
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+
+
+def planner_estimate(queryset):
+    """Оценка числа строк по плану PostgreSQL или None."""
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class EstimatedPage(Page):
+    """Страница, о следующей странице которой известно по лишней строке."""
+
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self.next_exists = has_next
+
+    def has_next(self):
+        return self.next_exists
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator с count из сохранённого счётчика или оценки."""
+
+    def __init__(self, object_list, per_page, stored_count=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.stored_count = stored_count
+        self.count_exact = True
+        self.count_stored = False
+
+    @cached_property
+    def count(self):
+        if self.stored_count is not None:
+            stored = self.stored_count()
+            if stored is not None:
+                self.count_exact = False
+                self.count_stored = True
+                return stored
+        estimate = planner_estimate(self.object_list)
+        if (estimate is not None
+                and estimate >= settings.PAGINATION_ESTIMATE_THRESHOLD):
+            self.count_exact = False
+            return estimate
+        return super().count
+
+    def page(self, number):
+        count = self.count
+        if self.count_exact:
+            return super().page(number)
+        number = self.validate_lower_bound(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage('That page contains no results')
+        if self.count_stored:
+            seen = bottom + len(rows)
+            if len(rows) <= self.per_page:
+                # Неполная страница - последняя: строк ровно seen.
+                self.count, self.count_exact = seen, True
+            else:
+                self.count = max(count, seen)
+        return EstimatedPage(rows[:self.per_page], number, self,
+                             has_next=len(rows) > self.per_page)
+
+    def count_rows(self):
+        """Точный COUNT(*) вместо оценки или сохранённого счётчика."""
+        self.count = Paginator.count.func(self)
+        self.count_exact, self.count_stored = True, False
+
+    def validate_lower_bound(self, number):
+        """validate_number без сверки с числом страниц."""
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger('That page number is not an integer')
+        if number < 1:
+            raise EmptyPage('That page number is less than 1')
+        return number
+
+
+class EstimatedCountPagination(PageNumberPagination):
+    """Пагинация по номеру страницы с дешёвым count."""
+    django_paginator_class = EstimatedCountPaginator
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.django_paginator_class = partial(
+            EstimatedCountPaginator,
+            stored_count=getattr(view, 'get_stored_count', None)
+        )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_page_number(self, request, paginator):
+        page_number = request.query_params.get(self.page_query_param)
+        if page_number in self.last_page_strings:
+            # Последняя страница по оценке или счётчику оказалась бы
+            # мимо настоящей, поэтому для неё строки считаются точно.
+            paginator.count_rows()
+        return super().get_page_number(request, paginator)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('count', self.page.paginator.count),
+            ('count_exact', self.page.paginator.count_exact),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data)
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties']['count_exact'] = {'type': 'boolean'}
+        return response_schema
+
+
+class IdCursorPagination(CursorPagination):
+    """Курсорная пагинация по id без COUNT(*) и OFFSET."""
+    ordering = 'id'
+
+
+class PageNumberOrCursorPagination(EstimatedCountPagination):
+    """Пагинация по номеру страницы или курсору из ?cursor=."""
+    cursor_query_param = 'cursor'
+    cursor_pagination_class = IdCursorPagination
+
+    def __init__(self):
+        self.cursor_paginator = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.cursor_query_param in request.query_params:
+            self.cursor_paginator = self.cursor_pagination_class()
+            return self.cursor_paginator.paginate_queryset(
+                queryset, request, view
+            )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -0,0 +1,103 @@
+"""Чтение с реплик базы данных."""
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from rest_framework.permissions import SAFE_METHODS
+
+from .cache import ModelVersionsMixin, get_last_modified
+
+STICKY_KEY = 'db-primary-sticky:{}'
+
+_state = threading.local()
+# Реплика -> момент time.monotonic(), до которого она считается недоступной.
+_unavailable = {}
+
+
+def get_read_alias():
+    """Реплика, выбранная для текущего запроса, или None."""
+    return getattr(_state, 'alias', None)
+
+
+def set_read_alias(alias):
+    _state.alias = alias
+
+
+def pick_replica():
+    """Случайная доступная реплика или None."""
+    now = time.monotonic()
+    aliases = [
+        alias for alias in settings.DATABASE_REPLICAS
+        if _unavailable.get(alias, 0) <= now
+    ]
+    random.shuffle(aliases)
+    for alias in aliases:
+        try:
+            connections[alias].ensure_connection()
+        except DatabaseError:
+            _unavailable[alias] = now + settings.REPLICA_RETRY_SECONDS
+            continue
+        return alias
+    return None
+
+
+def stick_to_primary(user):
+    """Читать данные пользователя с основной базы после его записи."""
+    cache.set(STICKY_KEY.format(user.pk), True,
+              settings.REPLICA_STICKINESS_SECONDS)
+
+
+def is_sticky(user):
+    return user.is_authenticated and bool(
+        cache.get(STICKY_KEY.format(user.pk))
+    )
+
+
+class ReplicaRouter:
+    """Чтение на реплику, выбранную для запроса, запись в default."""
+
+    def db_for_read(self, model, **hints):
+        return get_read_alias()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+
+class ReplicaReadsMixin:
+    """Направляет безопасные запросы вьюсета на реплику."""
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            set_read_alias(None)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if self.use_replica(request):
+            set_read_alias(pick_replica())
+
+    def use_replica(self, request):
+        if (request.method not in SAFE_METHODS
+                or not settings.DATABASE_REPLICAS
+                or is_sticky(request.user)):
+            return False
+        if not isinstance(self, ModelVersionsMixin):
+            return True
+        modified = get_last_modified(self.get_cache_version_keys())
+        return modified is None or (
+            time.time() - modified >= settings.REPLICA_STICKINESS_SECONDS
+        )
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if (request.method not in SAFE_METHODS
+                and response.status_code < 400
+                and request.user.is_authenticated):
+            stick_to_primary(request.user)
+        return super().finalize_response(request, response, *args, **kwargs)
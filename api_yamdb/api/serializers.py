@@ -1,11 +1,13 @@
-from django.db.models import Avg
-
-from rest_framework import serializers, status
+from rest_framework import serializers
 from rest_framework.relations import SlugRelatedField
 
+from reviews.export import RENDERERS, parse_moment
 from reviews.models import Categories, Comment, Genre, Review, Title
 from users.models import CustomUser
 
+from .fieldsets import SparseFieldsSerializerMixin
+from .lookups import CachedSlugRelatedField
+
 
 class CategoriesSerializer(serializers.ModelSerializer):
     """
@@ -26,23 +28,18 @@ class GenreSerializer(serializers.ModelSerializer):
         lookup_field = 'slug'
 
 
-class TitleSerializer(serializers.ModelSerializer):
+class TitleSerializer(SparseFieldsSerializerMixin,
+                      serializers.ModelSerializer):
     """
     Сериализатор для модели модели Title.
     """
     genre = GenreSerializer(read_only=True, many=True)
     category = CategoriesSerializer(read_only=True)
-    rating = serializers.SerializerMethodField()
-
-    def get_rating(self, obj):
-        return Review.objects.filter(title__id=obj.id
-                                     ).aggregate(rating=Avg('score')
-                                                 ).get('rating')
 
     class Meta:
         model = Title
         fields = ('id', 'name', 'year', 'description',
-                  'genre', 'category', 'rating')
+                  'genre', 'category', 'rating', 'reviews_count')
         read_only_fields = (
             'id',
             'name',
@@ -50,29 +47,31 @@ class TitleSerializer(serializers.ModelSerializer):
             'description',
             'genre',
             'category',
-            'rating')
+            'rating',
+            'reviews_count')
 
 
 class TitleCreateSerializer(serializers.ModelSerializer):
     """
     Сериализатор для модели модели Title.
     """
-    category = serializers.SlugRelatedField(
+    category = CachedSlugRelatedField(
         slug_field='slug',
         queryset=Categories.objects.all()
     )
-    genre = serializers.SlugRelatedField(
+    genre = CachedSlugRelatedField(
         slug_field='slug',
         queryset=Genre.objects.all(),
         many=True
     )
 
     class Meta:
-        fields = '__all__'
+        fields = ('id', 'name', 'year', 'category', 'description', 'genre')
         model = Title
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(SparseFieldsSerializerMixin,
+                       serializers.ModelSerializer):
     """
     Сериализатор/десериализатор для данных объектов модели Review.
     """
@@ -82,7 +81,8 @@ class ReviewSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Review
-        fields = ('id', 'text', 'author', 'score', 'pub_date',)
+        fields = ('id', 'text', 'author', 'score', 'pub_date',
+                  'comments_count')
 
     def validate_score(self, score):
         """
@@ -96,25 +96,9 @@ class ReviewSerializer(serializers.ModelSerializer):
             )
         return score
 
-    def validate(self, data):
-        """
-        Валидатор блокирует повторную попытку создания отзыва к конкретному
-        произведению в случае, если пользователь ранее уже оставил свой отзыв
-        к этому произведению.
-        """
-        title = self.context['request'].parser_context['kwargs']['title_id']
-        author = self.context['request'].user
-        review = Review.objects.filter(title_id=title, author=author)
-        if self.context['request'].method == 'POST':
-            if review.exists():
-                raise serializers.ValidationError(
-                    detail='Вы уже оставили свой отзыв к данному произведению',
-                    code=status.HTTP_400_BAD_REQUEST
-                )
-        return data
-
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(SparseFieldsSerializerMixin,
+                        serializers.ModelSerializer):
     """
     Сериализатор/десериализатор для данных объектов модели Comment.
     """
@@ -127,7 +111,8 @@ class CommentSerializer(serializers.ModelSerializer):
         fields = ('id', 'text', 'author', 'pub_date',)
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsSerializerMixin,
+                     serializers.ModelSerializer):
     """
     Сериализатор для модели модели CustomUser.
     """
@@ -175,3 +160,22 @@ class SignUpSerializer(serializers.Serializer):
 
 class AccountSerializer(UserSerializer):
     role = serializers.CharField(read_only=True)
+
+
+class ExportSerializer(serializers.Serializer):
+    """Параметры выгрузки отзывов и комментариев."""
+    output = serializers.ChoiceField(choices=tuple(RENDERERS),
+                                     default='ndjson')
+    title = serializers.IntegerField(required=False)
+    author = serializers.CharField(max_length=150, required=False)
+    since = serializers.CharField(required=False)
+    until = serializers.CharField(required=False)
+
+    def validate_moment(self, value):
+        try:
+            return parse_moment(value)
+        except ValueError as error:
+            raise serializers.ValidationError(str(error))
+
+    validate_since = validate_moment
+    validate_until = validate_moment
@@ -1,13 +1,67 @@
 from rest_framework import throttling
 
-ALLOWED_REQUEST = 1
 
+class SlidingWindowRateThrottle(throttling.SimpleRateThrottle):
+    """Ограничение частоты по скользящему окну из двух счётчиков."""
 
-class PostUserRateThrottle(throttling.UserRateThrottle):
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window, self.elapsed = divmod(self.now, self.duration)
+        current_key = f'{self.key}:{int(window)}'
+        previous_key = f'{self.key}:{int(window) - 1}'
+        self.previous = self.cache.get(previous_key, 0)
+        self.current = self.incr(current_key)
+        if self.estimate(self.current) > self.num_requests:
+            self.cache.decr(current_key)
+            self.current -= 1
+            return self.throttle_failure()
+        return True
+
+    def incr(self, key):
+        self.cache.add(key, 0, self.duration * 2)
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            self.cache.set(key, 1, self.duration * 2)
+            return 1
+
+    def estimate(self, current):
+        weight = 1 - self.elapsed / self.duration
+        return self.previous * weight + current
+
+    def wait(self):
+        """Время, через которое оценка опустится ниже лимита."""
+        window_left = self.duration - self.elapsed
+        allowed = self.num_requests - self.current - 1
+        if allowed < 0 or not self.previous:
+            return window_left
+        share = allowed / self.previous
+        return max(min(self.duration * (1 - share) - self.elapsed,
+                       window_left), 0)
+
+
+class UserRateThrottle(SlidingWindowRateThrottle,
+                       throttling.UserRateThrottle):
+    """Ограничение запросов пользователя по скользящему окну."""
+
+
+class AnonRateThrottle(SlidingWindowRateThrottle,
+                       throttling.AnonRateThrottle):
+    """Ограничение анонимных запросов по скользящему окну."""
+
+
+class PostUserRateThrottle(UserRateThrottle):
     """Контроль количества операций по созданию отзыва."""
     scope = 'post_user'
 
     def allow_request(self, request, view):
-        if (request.method == 'POST') > ALLOWED_REQUEST:
-            return False
-        return True
+        if request.method != 'POST':
+            return True
+        return super().allow_request(request, view)
@@ -1,9 +1,10 @@
-from django.urls import include, path
+from django.urls import include, path, re_path
 
 from rest_framework import routers
 
 from .views import (CategoriesViewSet, CommentViewSet, GenreViewSet,
-                    ReviewViewSet, TitleViewSet, UserViewSet, sign_up, token)
+                    ReviewViewSet, TitleViewSet, UserViewSet, export, sign_up,
+                    token)
 
 router_v1 = routers.DefaultRouter()
 router_v1.register(r'categories', CategoriesViewSet, basename='categories')
@@ -28,4 +29,9 @@ urlpatterns = [
         'v1/auth/token/',
         token,
     ),
+    re_path(
+        r'^v1/export/(?P<kind>reviews|comments)/$',
+        export,
+        name='export'
+    ),
 ]
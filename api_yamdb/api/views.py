@@ -1,110 +1,235 @@
 from uuid import uuid4
 
-from django.core.mail import send_mail
+from django.db import IntegrityError, transaction
+from django.http import HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, status, viewsets
-from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.decorators import (action, api_view, permission_classes,
+                                       throttle_classes)
+from rest_framework.exceptions import ValidationError
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import (AllowAny, IsAuthenticated,
                                         IsAuthenticatedOrReadOnly)
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework.settings import api_settings
 
-from reviews.models import Categories, Genre, Review, Title
+from reviews.export import RENDERERS, stream_export
+from reviews.models import Categories, Comment, Genre, Review, Title
+from reviews.ranking import rank_titles
 from users.models import CustomUser
+from users.outbox import enqueue_email
 
-from .filters import TitleGenreFilter
+from .authentication import UserClaimsRefreshToken
+from .cache import CachedResponseMixin, ConditionalGetMixin, version_key
+from .fastlist import FastListMixin
+from .fieldsets import SparseFieldsViewMixin
+from .filters import TitleGenreFilter, TitleSearchFilter
+from .metrics import InstrumentedViewMixin, registry
 from .mixins import CreateDestroyListViewSet
+from .pagination import EstimatedCountPagination, PageNumberOrCursorPagination
+from .replicas import ReplicaReadsMixin
 from .permissions import (IsAdmin, IsAdminOrReadOnly,
                           IsObjectOwnerModeratorAdminOrReadOnly)
 from .serializers import (AccountSerializer, CategoriesSerializer,
-                          CommentSerializer, GenreSerializer, ReviewSerializer,
-                          SignUpSerializer, TitleCreateSerializer,
-                          TitleSerializer, TokenSerializer, UserSerializer)
+                          CommentSerializer, ExportSerializer,
+                          GenreSerializer, ReviewSerializer, SignUpSerializer,
+                          TitleCreateSerializer, TitleSerializer,
+                          TokenSerializer, UserSerializer)
 from .throttling import PostUserRateThrottle
 
+# Ограничение на создание отзывов и комментариев добавляется к общим
+# ограничениям запросов пользователя и анонима, а не заменяет их.
+POST_THROTTLE_CLASSES = (
+    tuple(api_settings.DEFAULT_THROTTLE_CLASSES) + (PostUserRateThrottle,)
+)
 
-class ReviewViewSet(viewsets.ModelViewSet):
+DUPLICATE_REVIEW = 'Вы уже оставили свой отзыв к данному произведению'
+
+
+class ReviewViewSet(InstrumentedViewMixin, ReplicaReadsMixin,
+                    ConditionalGetMixin, SparseFieldsViewMixin,
+                    FastListMixin, viewsets.ModelViewSet):
     """
     Функция-обработчик для запросов по модели Review.
+    Список отзывов меняется вместе с версией произведения.
     """
     queryset = Review.objects.all()
     serializer_class = ReviewSerializer
-    pagination_class = PageNumberPagination
+    pagination_class = PageNumberOrCursorPagination
     permission_classes = (IsAuthenticatedOrReadOnly,
                           IsObjectOwnerModeratorAdminOrReadOnly)
-    throttle_classes = (PostUserRateThrottle,)
+    throttle_classes = POST_THROTTLE_CLASSES
+
+    def get_cache_version_keys(self):
+        if 'pk' in self.kwargs:
+            return [version_key(Review, self.kwargs['pk'])]
+        return [version_key(Title, self.kwargs.get('title_id'))]
+
+    def get_title(self):
+        """Произведение из URL, загружается один раз за запрос."""
+        if not hasattr(self, '_title'):
+            self._title = get_object_or_404(Title,
+                                            id=self.kwargs.get('title_id'))
+        return self._title
 
     def get_queryset(self):
-        title = get_object_or_404(Title, id=self.kwargs.get('title_id'))
-        new_queryset = title.review_title.all()
-        return new_queryset
+        if self.detail:
+            # Отзыв другого или несуществующего произведения не найдётся
+            # по условию на title_id, отдельный запрос произведения не нужен.
+            queryset = Review.objects.filter(
+                title_id=self.kwargs.get('title_id')
+            ).select_related('author')
+            if self.action in ('update', 'partial_update'):
+                # Рейтинг сдвигается на разницу со старой оценкой: два
+                # параллельных изменения не должны прочитать одну и ту же.
+                queryset = queryset.select_for_update(of=('self',))
+            return queryset
+        return self.get_title().review_title.select_related('author')
+
+    def get_stored_count(self):
+        """Число отзывов в списке хранится в самом произведении."""
+        return self.get_title().reviews_count
 
     def perform_create(self, serializer):
-        title = get_object_or_404(Title, id=self.kwargs.get('title_id'))
-        serializer.save(author=self.request.user, title=title)
-        return title.review_title.all()
+        """
+        Повторный отзыв отсекает ограничение unique_review, а не
+        предварительный запрос: лишний SELECT нужен только при ошибке,
+        чтобы отличить повтор от других нарушений целостности.
+        """
+        title = self.get_title()
+        try:
+            with transaction.atomic():
+                serializer.save(author=self.request.user, title=title)
+        except IntegrityError:
+            if not Review.objects.filter(title=title,
+                                         author=self.request.user).exists():
+                raise
+            raise ValidationError(
+                {api_settings.NON_FIELD_ERRORS_KEY: [DUPLICATE_REVIEW]}
+            )
+
+    @transaction.atomic
+    def update(self, request, *args, **kwargs):
+        return super().update(request, *args, **kwargs)
 
     def perform_update(self, serializer):
-        title = get_object_or_404(Title, id=self.kwargs.get('title_id'))
-        serializer.save(author=self.request.user, title=title)
-        return title.review_title.all()
+        serializer.save(author=self.request.user)
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(InstrumentedViewMixin, ReplicaReadsMixin,
+                     ConditionalGetMixin, SparseFieldsViewMixin,
+                     FastListMixin, viewsets.ModelViewSet):
     """
     Функция-обработчик для запросов по модели Comment.
+    Список комментариев меняется вместе с версией отзыва.
     """
     serializer_class = CommentSerializer
-    pagination_class = PageNumberPagination
+    pagination_class = PageNumberOrCursorPagination
     permission_classes = (
         IsObjectOwnerModeratorAdminOrReadOnly,
         IsAuthenticatedOrReadOnly,
     )
+    throttle_classes = POST_THROTTLE_CLASSES
+
+    def get_cache_version_keys(self):
+        if 'pk' in self.kwargs:
+            return [version_key(Comment, self.kwargs['pk'])]
+        return [version_key(Review, self.kwargs.get('review_id'))]
+
+    def get_review(self):
+        """Отзыв из URL, загружается один раз за запрос."""
+        if not hasattr(self, '_review'):
+            self._review = get_object_or_404(
+                Review, id=self.kwargs.get('review_id'),
+                title=self.kwargs.get('title_id')
+            )
+        return self._review
+
+    def get_stored_count(self):
+        """Число комментариев в списке хранится в самом отзыве."""
+        return self.get_review().comments_count
 
     def get_queryset(self):
-        review = get_object_or_404(Review, id=self.kwargs.get('review_id'),
-                                   title=self.kwargs.get('title_id'))
-        queryset = review.comment_review.all()
-        return queryset
+        if self.detail:
+            return Comment.objects.filter(
+                review_id=self.kwargs.get('review_id'),
+                review__title_id=self.kwargs.get('title_id')
+            ).select_related('author')
+        return self.get_review().comment_review.select_related('author')
 
+    @transaction.atomic
     def perform_create(self, serializer):
-        review = get_object_or_404(Review, id=self.kwargs.get('review_id'),
-                                   title=self.kwargs.get('title_id'))
-        serializer.save(author=self.request.user,
-                        review=review)
-        return review.comment_review.all()
+        """Комментарий и число комментариев отзыва сохраняются вместе."""
+        serializer.save(author=self.request.user, review=self.get_review())
 
     def perform_update(self, serializer):
-        review = get_object_or_404(Review, id=self.kwargs.get('review_id'),
-                                   title=self.kwargs.get('title_id'))
-        serializer.save(author=self.request.user,
-                        review=review)
-        return review.comment_review.all()
+        serializer.save(author=self.request.user)
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(InstrumentedViewMixin, ReplicaReadsMixin,
+                   ConditionalGetMixin, CachedResponseMixin,
+                   SparseFieldsViewMixin, FastListMixin,
+                   viewsets.ModelViewSet):
     """
     Функция-обработчик для запросов по модели Title.
     """
-    queryset = Title.objects.all()
+    cache_models = (Title, Genre, Categories, Review)
+    cache_detail_models = (Genre, Categories)
+    # Отзыв меняет рейтинг и число отзывов одного произведения, поэтому
+    # закешированные страницы списка сверяются с версиями своих
+    # произведений. Подборки упорядочены по отзывам и зависят от них.
+    cache_row_models = (Review,)
+    queryset = Title.objects.select_related(
+        'category'
+    ).prefetch_related('genre')
     permission_classes = (IsAdminOrReadOnly,)
-    pagination_class = PageNumberPagination
-    filter_backends = (DjangoFilterBackend,)
+    pagination_class = EstimatedCountPagination
+    filter_backends = (DjangoFilterBackend, TitleSearchFilter)
     filterset_class = TitleGenreFilter
+    sparse_actions = ('list', 'retrieve', 'top', 'trending')
 
     def get_serializer_class(self):
         if self.action == 'create' or self.action == 'partial_update':
             return TitleCreateSerializer
         return TitleSerializer
 
+    def get_cache_row_models(self):
+        if self.action in ('top', 'trending'):
+            return ()
+        return super().get_cache_row_models()
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action in ('top', 'trending'):
+            return rank_titles(queryset, self.action)
+        return queryset
+
+    @action(detail=False, methods=['get'])
+    def top(self, request):
+        """
+        Произведения с отзывами по убыванию байесовского рейтинга.
+        Принимает те же фильтры, что и список произведений.
+        """
+        return self.list(request)
+
+    @action(detail=False, methods=['get'])
+    def trending(self, request):
+        """
+        Произведения по убыванию популярности: сумма отзывов, вес которых
+        вдвое падает за TRENDING_HALF_LIFE_DAYS.
+        """
+        return self.list(request)
 
-class CategoriesViewSet(CreateDestroyListViewSet):
+
+class CategoriesViewSet(InstrumentedViewMixin, ReplicaReadsMixin,
+                        ConditionalGetMixin, CachedResponseMixin,
+                        CreateDestroyListViewSet):
     """
     Функция-обработчик для запросов по модели Categories.
     """
+    cache_models = (Categories,)
     queryset = Categories.objects.all()
     serializer_class = CategoriesSerializer
     lookup_field = 'slug'
@@ -114,10 +239,13 @@ class CategoriesViewSet(CreateDestroyListViewSet):
     search_fields = ('=name',)
 
 
-class GenreViewSet(CreateDestroyListViewSet):
+class GenreViewSet(InstrumentedViewMixin, ReplicaReadsMixin,
+                   ConditionalGetMixin, CachedResponseMixin,
+                   CreateDestroyListViewSet):
     """
     Функция-обработчик для запросов по модели Genre.
     """
+    cache_models = (Genre,)
     queryset = Genre.objects.all().order_by('id')
     serializer_class = GenreSerializer
     lookup_field = 'slug'
@@ -127,14 +255,15 @@ class GenreViewSet(CreateDestroyListViewSet):
     search_fields = ('=name',)
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(InstrumentedViewMixin, ReplicaReadsMixin,
+                  SparseFieldsViewMixin, viewsets.ModelViewSet):
     """
     Функция-обработчик для запросов по модели CustomUser.
     """
     queryset = CustomUser.objects.all().order_by('id')
     serializer_class = UserSerializer
     lookup_field = 'username'
-    pagination_class = PageNumberPagination
+    pagination_class = EstimatedCountPagination
     permission_classes = (IsAdmin,)
     filter_backends = (filters.SearchFilter,)
     search_fields = ('=username',)
@@ -147,7 +276,13 @@ class UserViewSet(viewsets.ModelViewSet):
         permission_classes=(IsAuthenticated,)
     )
     def me(self, request):
-        user = get_object_or_404(CustomUser, pk=request.user.id)
+        user = request.user
+        deferred = user.get_deferred_fields()
+        if deferred:
+            user.refresh_from_db(fields=deferred)
+        if request.method == 'GET':
+            return Response(self.get_serializer(user).data,
+                            status=status.HTTP_200_OK)
         serializer = self.get_serializer(user, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
         serializer.save()
@@ -166,7 +301,7 @@ def token(request):
     confirmation_code = serializer.validated_data['confirmation_code']
     if confirmation_code != user.confirmation_code:
         return Response(status=status.HTTP_400_BAD_REQUEST)
-    refresh = RefreshToken.for_user(user)
+    refresh = UserClaimsRefreshToken.for_user(user)
     return Response({'token': str(refresh.access_token)},
                     status=status.HTTP_200_OK)
 
@@ -179,16 +314,50 @@ def sign_up(request):
     username = serializer.validated_data['username']
     email = serializer.validated_data['email']
     confirmation_code = str(uuid4())
-    user, created = CustomUser.objects.get_or_create(
-        username=username,
-        email=email,
-        confirmation_code=confirmation_code
-    )
-    send_mail(
-        subject='Код подтверждения доступа Yamdb',
-        message=f'Код подтверждения доступа: {confirmation_code}',
-        from_email='admin@yamdb.com',
-        recipient_list=(email,))
+    with transaction.atomic():
+        user, created = CustomUser.objects.get_or_create(
+            username=username,
+            email=email,
+            confirmation_code=confirmation_code
+        )
+        enqueue_email(
+            subject='Код подтверждения доступа Yamdb',
+            message=f'Код подтверждения доступа: {confirmation_code}',
+            from_email='admin@yamdb.com',
+            recipient=email)
     return Response(
         serializer.data,
         status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes((IsAdmin,))
+@throttle_classes(())
+def metrics(request):
+    """Гистограммы времени запросов в текстовом формате Prometheus."""
+    return HttpResponse(
+        registry.render(),
+        content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
+
+
+@api_view(['GET'])
+@permission_classes((IsAdmin,))
+@throttle_classes(())
+def export(request, kind):
+    """
+    Потоковая выгрузка всех отзывов или комментариев в NDJSON или CSV
+    с фильтрами по произведению, автору и интервалу pub_date.
+    """
+    serializer = ExportSerializer(data=request.query_params)
+    serializer.is_valid(raise_exception=True)
+    filters = dict(serializer.validated_data)
+    output = filters.pop('output')
+    response = StreamingHttpResponse(
+        stream_export(kind, output, **filters),
+        content_type=RENDERERS[output][0]
+    )
+    response['Content-Disposition'] = (
+        f'attachment; filename="{kind}.{output}"'
+    )
+    return response
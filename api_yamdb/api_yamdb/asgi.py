@@ -1,7 +1,13 @@
+"""
+ASGI-точка входа. Django 2.2 не обрабатывает ASGI сам и не поддерживает
+асинхронные представления, поэтому WSGI-приложение оборачивается
+адаптером asgiref и выполняется в пуле потоков.
+"""
 import os
 
-from django.core.asgi import get_asgi_application
+from asgiref.wsgi import WsgiToAsgi
+from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
 
-application = get_asgi_application()
+application = WsgiToAsgi(get_wsgi_application())
@@ -0,0 +1,35 @@
+"""
+Настройки gunicorn для образа web.
+
+Воркеры gthread держат открытые соединения в общем опросе сокетов
+и отдают поток только запросу, который уже пришёл. Медленный клиент
+не занимает процесс целиком, как у синхронного воркера, а ответ ему
+дочитывает nginx из своего буфера. Django 2.2 не поддерживает
+асинхронные представления, поэтому конкурентность даёт пул потоков.
+
+Каждый поток держит своё соединение с PostgreSQL на время запроса
+(CONN_MAX_AGE = 0), так что одновременно их бывает до workers * threads
+на каждую базу. По умолчанию число воркеров ограничено так, чтобы это
+произведение не превышало GUNICORN_DB_CONNECTIONS (64): max_connections
+PostgreSQL по умолчанию 100, и запас остаётся сервису outbox и командам
+manage.py. Поднимая GUNICORN_WORKERS или GUNICORN_THREADS, увеличьте и
+max_connections.
+"""
+import multiprocessing
+import os
+
+bind = os.getenv('GUNICORN_BIND', '0:8000')
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.getenv('GUNICORN_THREADS', 8))
+db_connections = int(os.getenv('GUNICORN_DB_CONNECTIONS', 64))
+workers = int(os.getenv('GUNICORN_WORKERS', max(1, min(
+    multiprocessing.cpu_count() * 2 + 1, db_connections // threads
+))))
+# Соединение без запросов закрывается через keepalive секунд; воркер
+# gthread при этом не держит под него поток.
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+graceful_timeout = timeout
+# Перезапуск воркера через max_requests запросов ограничивает рост памяти.
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 5000))
+max_requests_jitter = max_requests // 10
@@ -22,7 +22,7 @@ class GenreAdmin(admin.ModelAdmin):
 @admin.register(Title)
 class TitleAdmin(admin.ModelAdmin):
     list_display = ('pk', 'name', 'year',
-                    'description', 'category')
+                    'description', 'category', 'rating')
     search_fields = ('name',)
     list_filter = ('year',)
     list_editable = ('category',)
@@ -0,0 +1,84 @@
+"""
+Состояние удаления объектов в текущем потоке.
+
+Collector Django сначала отправляет pre_delete всем удаляемым объектам,
+включая каскадные, и только после DELETE - post_delete. Обработчики
+pre_delete запоминают удаляемые объекты, поэтому post_delete видят всё
+удаление целиком: вычитают детей из родителя одним UPDATE на родителя
+и пропускают родителя, который удаляется вместе с ними.
+
+Первый pre_delete после post_delete начинает новое удаление. Если DELETE
+упал до post_delete, запрос завершается ошибкой, и состояние сбрасывается
+по request_finished.
+"""
+import threading
+
+from django.core.signals import request_finished
+from django.db.models.signals import post_delete, pre_delete
+from django.dispatch import receiver
+
+from .models import Comment, Review, Title
+
+_local = threading.local()
+
+
+class Deletion:
+    def __init__(self):
+        # (модель, pk) удаляемых объектов.
+        self.deleted = set()
+        # (модель родителя, pk) -> удаляемые дети, ещё не вычтенные.
+        self.pending = {}
+        self.finished = False
+
+
+def get_deletion():
+    deletion = getattr(_local, 'deletion', None)
+    if deletion is None:
+        deletion = _local.deletion = Deletion()
+    return deletion
+
+
+@receiver(pre_delete, sender=Comment)
+@receiver(pre_delete, sender=Review)
+@receiver(pre_delete, sender=Title)
+def collect_deleted(sender, instance, **kwargs):
+    """Запоминает удаляемый объект у его родителя."""
+    deletion = get_deletion()
+    if deletion.finished:
+        deletion = _local.deletion = Deletion()
+    deletion.deleted.add((sender, instance.pk))
+    if sender is Review:
+        parent = (Title, instance.title_id)
+    elif sender is Comment:
+        parent = (Review, instance.review_id)
+    else:
+        return
+    deletion.pending.setdefault(parent, []).append(instance)
+
+
+@receiver(post_delete, sender=Comment)
+@receiver(post_delete, sender=Review)
+@receiver(post_delete, sender=Title)
+def finish_deletion(sender, **kwargs):
+    get_deletion().finished = True
+
+
+@receiver(request_finished)
+def reset_deletion(**kwargs):
+    _local.deletion = None
+
+
+def is_deleted(model, pk):
+    """Удаляется ли объект в текущем удалении."""
+    return (model, pk) in get_deletion().deleted
+
+
+def pop_pending(parent, pk):
+    """
+    Удаляемые дети родителя, ещё не вычтенные из его счётчиков, или
+    пустой список, если их уже вычли или родитель удаляется сам.
+    """
+    children = get_deletion().pending.pop((parent, pk), [])
+    if is_deleted(parent, pk):
+        return []
+    return children
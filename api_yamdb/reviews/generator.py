@@ -0,0 +1,159 @@
+"""
+Синтетический набор данных для нагрузочных замеров.
+
+Строки генерируются лениво и воспроизводимо для заданного seed в том же
+формате, что читает importer, и загружаются через Importer пачками
+bulk_create. Популярность произведений и жанров распределена по закону
+Ципфа: немногие произведения собирают большую часть отзывов.
+"""
+import datetime
+import random
+from bisect import bisect
+from itertools import accumulate
+
+from django.utils import timezone
+
+from users.models import CustomUser
+
+ROLE_WEIGHTS = (
+    (CustomUser.USER, 90),
+    (CustomUser.MODERATOR, 8),
+    (CustomUser.ADMIN, 2),
+)
+# Число жанров у произведения и его вес.
+GENRE_FAN_OUT = ((1, 50), (2, 35), (3, 15))
+ADJECTIVES = ('Тихий', 'Последний', 'Красный', 'Далёкий', 'Ночной',
+              'Белый', 'Старый', 'Бесконечный', 'Северный', 'Золотой')
+NOUNS = ('дом', 'берег', 'город', 'сад', 'поезд', 'океан', 'лес', 'мост',
+         'свет', 'ветер', 'остров', 'голос')
+WORDS = ('сюжет', 'актёры', 'финал', 'музыка', 'темп', 'герои', 'атмосфера',
+         'диалоги', 'картинка', 'идея')
+PERIOD_DAYS = 3 * 365
+# Конец периода дат публикации. Дата фиксирована, а не берётся из
+# текущего времени, чтобы один seed давал одни и те же строки, а значит
+# и ту же популярность, при любом запуске.
+UNTIL = datetime.datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+class DatasetGenerator:
+    """
+    Строки пользователей, категорий, жанров, произведений, отзывов и
+    комментариев. id произведений идут после id пользователей, чтобы
+    не нарушать ограничение author_not_title_again.
+    """
+
+    def __init__(self, users, titles, reviews, comments, categories=10,
+                 genres=30, skew=1.1, seed=2022, until=UNTIL):
+        self.counts = {
+            'users': users,
+            'categories': categories,
+            'genres': genres,
+            'titles': titles,
+            'reviews': reviews,
+            'comments': comments,
+        }
+        self.skew = skew
+        self.seed = seed
+        self.until = until
+        self.title_ids = range(users + 1, users + titles + 1)
+
+    def randomizer(self, kind):
+        return random.Random(f'{self.seed}:{kind}')
+
+    def zipf_weights(self, size):
+        return [1 / rank ** self.skew for rank in range(1, size + 1)]
+
+    def pub_date(self, randomizer):
+        return self.until - datetime.timedelta(
+            seconds=randomizer.randrange(PERIOD_DAYS * 86400)
+        )
+
+    def rows(self, kind):
+        return getattr(self, f'generate_{kind}')(self.randomizer(kind))
+
+    def generate_users(self, randomizer):
+        roles, weights = zip(*ROLE_WEIGHTS)
+        cumulative = list(accumulate(weights))
+        for index in range(1, self.counts['users'] + 1):
+            yield {
+                'id': index,
+                'username': f'user{index}',
+                'email': f'user{index}@yamdb.fake',
+                'role': roles[bisect(cumulative,
+                                     randomizer.random() * cumulative[-1])],
+            }
+
+    def generate_categories(self, randomizer):
+        for index in range(1, self.counts['categories'] + 1):
+            yield {'name': f'Категория {index}', 'slug': f'category-{index}'}
+
+    def generate_genres(self, randomizer):
+        for index in range(1, self.counts['genres'] + 1):
+            yield {'name': f'Жанр {index}', 'slug': f'genre-{index}'}
+
+    def generate_titles(self, randomizer):
+        genres = range(1, self.counts['genres'] + 1)
+        genre_weights = list(accumulate(self.zipf_weights(len(genres))))
+        sizes, size_weights = zip(*GENRE_FAN_OUT)
+        for title_id in self.title_ids:
+            size = min(randomizer.choices(sizes, size_weights)[0],
+                       len(genres))
+            chosen = set()
+            while len(chosen) < size:
+                chosen.add(randomizer.choices(
+                    genres, cum_weights=genre_weights
+                )[0])
+            yield {
+                'id': title_id,
+                'name': '{} {} {}'.format(randomizer.choice(ADJECTIVES),
+                                          randomizer.choice(NOUNS), title_id),
+                'year': min(int(randomizer.triangular(1900, 2030, 2020)),
+                            self.until.year),
+                'category': 'category-{}'.format(
+                    randomizer.randint(1, self.counts['categories'])
+                ),
+                'genre': [f'genre-{genre}' for genre in sorted(chosen)],
+            }
+
+    def review_counts(self):
+        """
+        Число отзывов на каждое произведение. Порядок популярности
+        перемешан, чтобы самые обсуждаемые не шли первыми по id.
+        Отзывов у произведения не больше, чем пользователей.
+        """
+        weights = self.zipf_weights(len(self.title_ids))
+        total = sum(weights)
+        counts = [
+            min(round(self.counts['reviews'] * weight / total),
+                self.counts['users'])
+            for weight in weights
+        ]
+        self.randomizer('popularity').shuffle(counts)
+        return counts
+
+    def generate_reviews(self, randomizer):
+        users = range(1, self.counts['users'] + 1)
+        review_id = 0
+        for title_id, count in zip(self.title_ids, self.review_counts()):
+            for author_id in randomizer.sample(users, count):
+                review_id += 1
+                yield {
+                    'id': review_id,
+                    'title_id': title_id,
+                    'author_id': author_id,
+                    'score': min(max(round(randomizer.gauss(7, 2)), 1), 10),
+                    'text': ' '.join(randomizer.choices(WORDS, k=12)),
+                    'pub_date': self.pub_date(randomizer),
+                }
+
+    def generate_comments(self, randomizer):
+        reviews = sum(self.review_counts())
+        if not reviews:
+            return
+        for _ in range(self.counts['comments']):
+            yield {
+                'review_id': randomizer.randint(1, reviews),
+                'author_id': randomizer.randint(1, self.counts['users']),
+                'text': ' '.join(randomizer.choices(WORDS, k=6)),
+                'pub_date': self.pub_date(randomizer),
+            }
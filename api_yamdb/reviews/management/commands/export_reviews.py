@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from reviews.export import (CHUNK_SIZE, EXPORTS, RENDERERS, parse_moment,
+                            stream_export)
+
+
+class Command(BaseCommand):
+    help = 'Выгружает отзывы или комментарии в NDJSON или CSV.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=tuple(EXPORTS))
+        parser.add_argument('--output', choices=tuple(RENDERERS),
+                            default='ndjson')
+        parser.add_argument('--title', type=int,
+                            help='id произведения.')
+        parser.add_argument('--author', help='username автора.')
+        parser.add_argument(
+            '--since',
+            help='Начало интервала pub_date в ISO 8601, включительно.'
+        )
+        parser.add_argument(
+            '--until',
+            help='Конец интервала pub_date в ISO 8601, не включительно.'
+        )
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            since, until = (
+                parse_moment(options[name]) if options[name] else None
+                for name in ('since', 'until')
+            )
+        except ValueError as error:
+            raise CommandError(error)
+        chunks = stream_export(
+            options['kind'],
+            options['output'],
+            chunk_size=options['chunk_size'],
+            title=options['title'],
+            author=options['author'],
+            since=since,
+            until=until,
+        )
+        for chunk in chunks:
+            self.stdout.write(chunk, ending='')
@@ -0,0 +1,65 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.cache import invalidate_bulk
+from reviews.export import parse_moment
+from reviews.generator import UNTIL, DatasetGenerator
+from reviews.importer import BATCH_SIZE, KINDS, Importer
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет базу воспроизводимым синтетическим набором данных '
+        'заданного размера с перекосом популярности произведений.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10000)
+        parser.add_argument('--categories', type=int, default=10)
+        parser.add_argument('--genres', type=int, default=30)
+        parser.add_argument('--titles', type=int, default=20000)
+        parser.add_argument('--reviews', type=int, default=1000000)
+        parser.add_argument('--comments', type=int, default=500000)
+        parser.add_argument(
+            '--skew',
+            type=float,
+            default=1.1,
+            help='Показатель распределения Ципфа для популярности.'
+        )
+        parser.add_argument('--seed', type=int, default=2022)
+        parser.add_argument(
+            '--until',
+            default=UNTIL.isoformat(),
+            help='Конец периода дат публикации в ISO 8601.'
+        )
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            until = parse_moment(options['until'])
+        except ValueError as error:
+            raise CommandError(error)
+        generator = DatasetGenerator(
+            users=options['users'],
+            titles=options['titles'],
+            reviews=options['reviews'],
+            comments=options['comments'],
+            categories=options['categories'],
+            genres=options['genres'],
+            skew=options['skew'],
+            seed=options['seed'],
+            until=until,
+        )
+        importer = Importer(options['batch_size'])
+        for kind in KINDS:
+            started = time.perf_counter()
+            count = importer.load(kind, generator.rows(kind))
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f'{kind}: {count} строк за {elapsed:.1f} с, '
+                f'{count / max(elapsed, 1e-9):.0f} строк/с'
+            )
+        importer.finish()
+        invalidate_bulk(importer.changed)
+        self.stdout.write(self.style.SUCCESS('Набор данных создан'))
@@ -0,0 +1,55 @@
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.cache import invalidate_bulk
+from reviews.importer import (BATCH_SIZE, KINDS, Importer, ImportDataError,
+                              find_files, read_rows)
+
+
+class Command(BaseCommand):
+    help = (
+        'Загружает категории, жанры, пользователей, произведения, отзывы '
+        'и комментарии из файлов <вид>.csv или <вид>.jsonl в каталоге.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            help='Каталог с файлами или один файл вместе с --kind.'
+        )
+        parser.add_argument('--kind', choices=KINDS)
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument(
+            '--ignore-conflicts',
+            action='store_true',
+            help='Пропускать строки, которые уже есть в базе.'
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        if options['kind']:
+            files = [(options['kind'], path)]
+        elif path.is_dir():
+            files = list(find_files(path))
+        else:
+            raise CommandError('Для одного файла укажите --kind.')
+        if not files:
+            raise CommandError(f'В {path} нет файлов для загрузки.')
+        importer = Importer(options['batch_size'],
+                            options['ignore_conflicts'])
+        for kind, file_path in files:
+            started = time.perf_counter()
+            try:
+                count = importer.load(kind, read_rows(file_path))
+            except ImportDataError as error:
+                raise CommandError(f'{file_path}: {error}')
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f'{kind}: {count} строк за {elapsed:.1f} с, '
+                f'{count / max(elapsed, 1e-9):.0f} строк/с'
+            )
+        importer.finish()
+        invalidate_bulk(importer.changed)
+        self.stdout.write(self.style.SUCCESS('Загрузка завершена'))
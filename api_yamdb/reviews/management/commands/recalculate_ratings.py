@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.models import Title
+
+
+class Command(BaseCommand):
+    help = ('Пересчитывает сохранённый рейтинг и популярность всех '
+            'произведений по отзывам.')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            updated = Title.objects.recalculate_rating()
+            trending = Title.objects.recalculate_trending()
+        self.stdout.write(
+            self.style.SUCCESS(f'Пересчитан рейтинг произведений: {updated}')
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Пересчитана популярность произведений с отзывами: {trending}'
+        ))
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.models import Review, Title
+
+
+class Command(BaseCommand):
+    help = ('Сверяет сохранённое число отзывов произведений и комментариев '
+            'отзывов с таблицами и исправляет разошедшиеся записи.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Только показать число разошедшихся записей.'
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            # id читаются заранее: после первого UPDATE подзапрос
+            # расхождений уже не нашёл бы исправленные записи.
+            titles = Title.objects.filter(pk__in=list(
+                Title.objects.with_drifted_reviews_count().values_list(
+                    'pk', flat=True
+                )
+            ))
+            reviews = Review.objects.filter(pk__in=list(
+                Review.objects.with_drifted_comments_count().values_list(
+                    'pk', flat=True
+                )
+            ))
+            if options['dry_run']:
+                drifted_titles, drifted_reviews = (titles.count(),
+                                                   reviews.count())
+            else:
+                # Вместе с числом отзывов пересчитывается и рейтинг,
+                # который от него зависит.
+                drifted_titles = titles.recalculate_rating()
+                drifted_reviews = reviews.recalculate_comments_count()
+        self.stdout.write(self.style.SUCCESS(
+            f'Разошлось число отзывов у произведений: {drifted_titles}'
+        ))
+        self.stdout.write(self.style.SUCCESS(
+            f'Разошлось число комментариев у отзывов: {drifted_reviews}'
+        ))
@@ -0,0 +1,48 @@
+from django.db import migrations
+
+FTS_TABLE = 'reviews_title_fts'
+INDEXES = {
+    'postgresql': (
+        'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+        "CREATE INDEX IF NOT EXISTS title_name_tsv_idx ON reviews_title "
+        "USING GIN (to_tsvector('simple'::regconfig, COALESCE(name, '')))",
+        'CREATE INDEX IF NOT EXISTS title_name_trgm_idx ON reviews_title '
+        'USING GIN (name gin_trgm_ops)',
+    ),
+    'sqlite': (
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+        f"name, tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        f'INSERT INTO {FTS_TABLE}(rowid, name) '
+        'SELECT id, name FROM reviews_title',
+    ),
+}
+DROP_INDEXES = {
+    'postgresql': (
+        'DROP INDEX IF EXISTS title_name_tsv_idx',
+        'DROP INDEX IF EXISTS title_name_trgm_idx',
+    ),
+    'sqlite': (
+        f'DROP TABLE IF EXISTS {FTS_TABLE}',
+    ),
+}
+
+
+def create_search_indexes(apps, schema_editor):
+    for statement in INDEXES.get(schema_editor.connection.vendor, ()):
+        schema_editor.execute(statement)
+
+
+def drop_search_indexes(apps, schema_editor):
+    for statement in DROP_INDEXES.get(schema_editor.connection.vendor, ()):
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_review_comment_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 2.2.16 on 2026-10-18 18:03
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import (Case, ExpressionWrapper, F, FloatField, Value,
+                              When)
+from django.db.models.functions import Cast
+
+
+def fill_bayesian_rating(apps, schema_editor):
+    db_alias = schema_editor.connection.alias
+    Title = apps.get_model('reviews', 'Title')
+    weight = settings.RATING_PRIOR_WEIGHT
+    Title.objects.using(db_alias).update(bayesian_rating=Case(
+        When(rating_count=0, then=Value(None)),
+        default=ExpressionWrapper(
+            (Cast(F('rating_sum'), FloatField())
+             + Value(settings.RATING_PRIOR_MEAN * weight))
+            / (F('rating_count') + Value(weight)),
+            output_field=FloatField()
+        ),
+        output_field=FloatField()
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_title_year_genre_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='bayesian_rating',
+            field=models.FloatField(blank=True, editable=False, null=True, verbose_name='Байесовский рейтинг'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='trending_score',
+            field=models.FloatField(default=0, editable=False, verbose_name='Популярность'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['bayesian_rating', 'id'], name='title_bayesian_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['trending_score', 'id'], name='title_trending_id_idx'),
+        ),
+        migrations.RunPython(fill_bayesian_rating, migrations.RunPython.noop),
+    ]
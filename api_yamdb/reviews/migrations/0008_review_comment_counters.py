@@ -0,0 +1,44 @@
+# Generated by Django 2.2.16 on 2026-10-18 21:40
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_comments_count(apps, schema_editor):
+    db_alias = schema_editor.connection.alias
+    Comment = apps.get_model('reviews', 'Comment')
+    Review = apps.get_model('reviews', 'Review')
+    comments = Comment.objects.using(db_alias).filter(
+        review=OuterRef('pk')
+    ).order_by().values('review')
+    Review.objects.using(db_alias).update(comments_count=Coalesce(
+        Subquery(comments.annotate(total=Count('id')).values('total')),
+        0
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0007_title_rankings'),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name='title',
+            old_name='rating_count',
+            new_name='reviews_count',
+        ),
+        migrations.AlterField(
+            model_name='title',
+            name='reviews_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество отзывов'),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество комментариев'),
+        ),
+        migrations.RunPython(fill_comments_count, migrations.RunPython.noop),
+    ]
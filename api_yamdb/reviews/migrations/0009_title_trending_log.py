@@ -0,0 +1,54 @@
+# Generated by Django 2.2.16 on 2026-10-18 23:10
+
+import datetime
+import math
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def fill_trending_score(apps, schema_editor):
+    """Логарифм суммы вкладов 2 ** ((pub_date - эпоха) / полураспад)."""
+    db_alias = schema_editor.connection.alias
+    Review = apps.get_model('reviews', 'Review')
+    Title = apps.get_model('reviews', 'Title')
+    epoch = timezone.make_aware(
+        datetime.datetime.strptime(settings.TRENDING_EPOCH, '%Y-%m-%d'),
+        timezone.utc
+    )
+    half_life = datetime.timedelta(days=settings.TRENDING_HALF_LIFE_DAYS)
+    sums = {}
+    reviews = Review.objects.using(db_alias).order_by().values_list(
+        'title_id', 'pub_date'
+    )
+    for title_id, pub_date in reviews.iterator():
+        exponent = math.log(2) * ((pub_date - epoch) / half_life)
+        top, total = sums.get(title_id, (exponent, 0.0))
+        if exponent > top:
+            total *= math.exp(top - exponent)
+            top = exponent
+        sums[title_id] = (top, total + math.exp(exponent - top))
+    Title.objects.using(db_alias).update(trending_score=None)
+    Title.objects.using(db_alias).bulk_update(
+        [Title(pk=pk, trending_score=top + math.log(total))
+         for pk, (top, total) in sums.items()],
+        ['trending_score'],
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0008_review_comment_counters'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='title',
+            name='trending_score',
+            field=models.FloatField(blank=True, editable=False, null=True, verbose_name='Популярность'),
+        ),
+        migrations.RunPython(fill_trending_score, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,14 @@
+
 from django.conf import settings
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.db.models import (DEFERRED, Avg, Case, Count, ExpressionWrapper,
+                              F, FloatField, OuterRef, Subquery, Sum, Value,
+                              When)
+from django.db.models.functions import Cast, Coalesce, Greatest
 
+from .ranking import (add_trending, bayesian_rating, subtract_trending,
+                      sum_trending)
 from .validators import validate_emptiness, validate_year
 
 
@@ -33,9 +40,110 @@ class Genre(models.Model):
         return self.name
 
 
+class TitleQuerySet(models.QuerySet):
+    """
+    Операции над сохранённым рейтингом произведений.
+    """
+
+    def update_rating(self, score_delta, count_delta, trending=None):
+        """
+        Сдвигает сумму и количество оценок на заданные величины и
+        пересчитывает средний и байесовский рейтинг одним UPDATE без
+        чтения отзывов. trending - показатель вклада добавленных
+        (count_delta > 0) или удалённых отзывов в популярность. Счётчик,
+        разошедшийся с отзывами, не уходит ниже нуля.
+        """
+        new_sum = Greatest(F('rating_sum') + score_delta, 0)
+        new_count = Greatest(F('reviews_count') + count_delta, 0)
+        no_reviews = When(reviews_count__lte=-count_delta, then=Value(None))
+        changes = {}
+        if trending is not None and count_delta > 0:
+            changes['trending_score'] = add_trending(trending)
+        elif trending is not None and count_delta < 0:
+            changes['trending_score'] = Case(
+                no_reviews,
+                default=subtract_trending(trending),
+                output_field=FloatField()
+            )
+        return self.update(
+            rating_sum=new_sum,
+            reviews_count=new_count,
+            rating=Case(
+                no_reviews,
+                default=ExpressionWrapper(
+                    Cast(new_sum, FloatField()) / new_count,
+                    output_field=FloatField()
+                ),
+                output_field=FloatField()
+            ),
+            bayesian_rating=Case(
+                no_reviews,
+                default=bayesian_rating(new_sum, new_count),
+                output_field=FloatField()
+            ),
+            **changes
+        )
+
+    def recalculate_rating(self):
+        """
+        Пересчитывает сумму, количество отзывов, средний и байесовский
+        рейтинг по отзывам.
+        """
+        reviews = Review.objects.filter(
+            title=OuterRef('pk')
+        ).order_by().values('title')
+        updated = self.update(
+            rating_sum=Coalesce(
+                Subquery(reviews.annotate(total=Sum('score')).values('total')),
+                0
+            ),
+            reviews_count=Coalesce(
+                Subquery(reviews.annotate(total=Count('id')).values('total')),
+                0
+            ),
+            rating=Subquery(
+                reviews.annotate(average=Avg('score')).values('average'),
+                output_field=FloatField()
+            )
+        )
+        self.update(bayesian_rating=Case(
+            When(reviews_count=0, then=Value(None)),
+            default=bayesian_rating(F('rating_sum'), F('reviews_count')),
+            output_field=FloatField()
+        ))
+        return updated
+
+    def with_drifted_reviews_count(self):
+        """Произведения, у которых reviews_count разошёлся с отзывами."""
+        reviews = Review.objects.filter(
+            title=OuterRef('pk')
+        ).order_by().values('title')
+        return self.annotate(actual_reviews_count=Coalesce(
+            Subquery(reviews.annotate(total=Count('id')).values('total')),
+            0
+        )).exclude(reviews_count=F('actual_reviews_count'))
+
+    def recalculate_trending(self, batch_size=1000):
+        """Пересчитывает популярность по датам отзывов."""
+        reviews = Review.objects.filter(
+            title__in=self.values('pk')
+        ).order_by().values_list('title_id', 'pub_date')
+        scores = sum_trending(reviews.iterator())
+        self.exclude(trending_score=None).update(trending_score=None)
+        self.model.objects.bulk_update(
+            [self.model(pk=pk, trending_score=score)
+             for pk, score in scores.items()],
+            ['trending_score'],
+            batch_size=batch_size
+        )
+        return len(scores)
+
+
 class Title(models.Model):
     """
     Модель для создания произведений.
+    Рейтинг и число отзывов хранятся в самой записи и обновляются при
+    изменении отзывов.
     """
     name = models.TextField('Название', max_length=256, db_index=True)
     year = models.IntegerField(
@@ -62,9 +170,46 @@ class Title(models.Model):
         max_length=256,
         blank=True,
     )
+    rating_sum = models.PositiveIntegerField(
+        'Сумма оценок',
+        default=0,
+        editable=False
+    )
+    reviews_count = models.PositiveIntegerField(
+        'Количество отзывов',
+        default=0,
+        editable=False
+    )
+    rating = models.FloatField(
+        'Рейтинг',
+        blank=True,
+        null=True,
+        editable=False
+    )
+    bayesian_rating = models.FloatField(
+        'Байесовский рейтинг',
+        blank=True,
+        null=True,
+        editable=False
+    )
+    trending_score = models.FloatField(
+        'Популярность',
+        blank=True,
+        null=True,
+        editable=False
+    )
+
+    objects = TitleQuerySet.as_manager()
 
     class Meta:
-        ordering = ('-year',)
+        ordering = ('-year', '-id')
+        indexes = [
+            models.Index(fields=('year', 'id'), name='title_year_id_idx'),
+            models.Index(fields=('bayesian_rating', 'id'),
+                         name='title_bayesian_id_idx'),
+            models.Index(fields=('trending_score', 'id'),
+                         name='title_trending_id_idx'),
+        ]
         verbose_name = 'Название произведения'
         verbose_name_plural = 'Названия произведений'
 
@@ -72,10 +217,45 @@ class Title(models.Model):
         return self.name
 
 
+class ReviewQuerySet(models.QuerySet):
+    """
+    Операции над сохранённым числом комментариев к отзывам.
+    """
+
+    def update_comments_count(self, delta):
+        """
+        Сдвигает число комментариев одним UPDATE без чтения отзыва, но
+        не ниже нуля.
+        """
+        return self.update(
+            comments_count=Greatest(F('comments_count') + delta, 0)
+        )
+
+    def comments_count_subquery(self):
+        comments = Comment.objects.filter(
+            review=OuterRef('pk')
+        ).order_by().values('review')
+        return Coalesce(
+            Subquery(comments.annotate(total=Count('id')).values('total')),
+            0
+        )
+
+    def recalculate_comments_count(self):
+        """Пересчитывает число комментариев по таблице комментариев."""
+        return self.update(comments_count=self.comments_count_subquery())
+
+    def with_drifted_comments_count(self):
+        """Отзывы, у которых comments_count разошёлся с комментариями."""
+        return self.annotate(
+            actual_comments_count=self.comments_count_subquery()
+        ).exclude(comments_count=F('actual_comments_count'))
+
+
 class Review(models.Model):
     """
     Модель для создания отзыва, который связан с конкретным произведением
     (модель Title). Автор создает только один отзыв к конкретному произведению.
+    Число комментариев хранится в самой записи.
     """
     title = models.ForeignKey(
         Title,
@@ -110,10 +290,20 @@ class Review(models.Model):
         verbose_name='Дата',
         auto_now_add=True,
         db_index=True)
+    comments_count = models.PositiveIntegerField(
+        'Количество комментариев',
+        default=0,
+        editable=False
+    )
+
+    objects = ReviewQuerySet.as_manager()
 
     class Meta:
         ordering = ('id',)
         db_table = 'review'
+        indexes = [
+            models.Index(fields=('title', 'id'), name='review_title_id_idx'),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=('author', 'title',),
@@ -124,6 +314,18 @@ class Review(models.Model):
             )
         ]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Запоминает произведение и оценку из базы, чтобы при сохранении
+        сдвинуть рейтинг на разницу оценок без пересчёта по отзывам.
+        """
+        instance = super().from_db(db, field_names, values)
+        loaded = dict(zip(field_names, values))
+        instance.loaded_rating = (loaded.get('title_id', DEFERRED),
+                                  loaded.get('score', DEFERRED))
+        return instance
+
     def __str__(self) -> str:
         return self.text[:25]
 
@@ -167,6 +369,10 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ('id',)
+        indexes = [
+            models.Index(fields=('review', 'id'),
+                         name='comment_review_id_idx'),
+        ]
 
     def __str__(self) -> str:
         return self.text[:15]
@@ -0,0 +1,114 @@
+"""
+Подборки произведений: лучшие по оценкам и популярные сейчас.
+
+Байесовский рейтинг сглаживает среднюю оценку к RATING_PRIOR_MEAN с весом
+RATING_PRIOR_WEIGHT условных оценок, чтобы единственный отзыв на 10 не
+обгонял сотню отзывов со средним 9.
+
+Популярность - сумма вкладов отзывов, каждый из которых вдвое теряет вес
+за TRENDING_HALF_LIFE_DAYS. Вклад считается относительно TRENDING_EPOCH:
+общий множитель затухания одинаков для всех произведений, поэтому порядок
+не зависит от текущего момента, а новый или удалённый отзыв сдвигает сумму
+только на свой вклад. Вклад растёт экспоненциально и за годы вышел бы за
+пределы float, поэтому хранится натуральный логарифм суммы: вклад отзыва
+задаётся показателем trending_exponent, а суммы складываются и вычитаются
+через log-sum-exp. У произведения без отзывов популярности нет (NULL).
+"""
+import datetime
+import math
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import (Case, ExpressionWrapper, F, FloatField, Value,
+                              When)
+from django.db.models.functions import Cast, Exp, Greatest, Least, Ln
+from django.utils import timezone
+
+if settings.TRENDING_HALF_LIFE_DAYS <= 0:
+    raise ImproperlyConfigured('TRENDING_HALF_LIFE_DAYS должен быть больше 0')
+
+TRENDING_EPOCH = timezone.make_aware(
+    datetime.datetime.strptime(settings.TRENDING_EPOCH, '%Y-%m-%d'),
+    timezone.utc
+)
+TRENDING_HALF_LIFE = datetime.timedelta(days=settings.TRENDING_HALF_LIFE_DAYS)
+
+# Условие попадания в подборку и порядок выдачи. Условия записаны
+# диапазоном, чтобы и COUNT, и страница читались по индексу подборки:
+# байесовский рейтинг положителен у всех произведений с отзывами.
+RANKINGS = {
+    'top': ({'bayesian_rating__gt': 0}, ('-bayesian_rating', '-id')),
+    'trending': ({'trending_score__isnull': False},
+                 ('-trending_score', '-id')),
+}
+# Доля суммы, которая остаётся после вычитания вклада, не меньше
+# погрешности float: иначе логарифм нуля при ошибке округления.
+MIN_REMAINDER = 2 ** -52
+
+
+def bayesian_rating(score_sum, count):
+    """Выражение байесовского рейтинга по сумме и количеству оценок."""
+    weight = settings.RATING_PRIOR_WEIGHT
+    return ExpressionWrapper(
+        (Cast(score_sum, FloatField())
+         + Value(settings.RATING_PRIOR_MEAN * weight))
+        / (count + Value(weight)),
+        output_field=FloatField()
+    )
+
+
+def trending_exponent(pub_date):
+    """
+    Натуральный логарифм вклада отзыва, опубликованного в pub_date:
+    вклад удваивается за каждый период полураспада после эпохи.
+    """
+    return math.log(2) * ((pub_date - TRENDING_EPOCH) / TRENDING_HALF_LIFE)
+
+
+def add_trending(exponent):
+    """Популярность после добавления вклада exp(exponent) к сумме."""
+    score = F('trending_score')
+    top = Greatest(score, Value(exponent))
+    return Case(
+        When(trending_score__isnull=True, then=Value(exponent)),
+        default=top + Ln(Exp(score - top) + Exp(Value(exponent) - top)),
+        output_field=FloatField()
+    )
+
+
+def subtract_trending(exponent):
+    """
+    Популярность после вычитания вклада exp(exponent) из суммы; когда
+    отзывов не остаётся, вызывающий сам сбрасывает её в NULL.
+    """
+    score = F('trending_score')
+    remainder = Value(1.0) - Exp(Least(Value(exponent) - score, Value(0.0)))
+    return ExpressionWrapper(
+        score + Ln(Greatest(remainder, Value(MIN_REMAINDER))),
+        output_field=FloatField()
+    )
+
+
+def sum_trending(pairs):
+    """
+    Популярность по парам (id произведения, дата отзыва): логарифм суммы
+    вкладов без перехода к самим вкладам.
+    """
+    sums = {}
+    for title_id, pub_date in pairs:
+        exponent = trending_exponent(pub_date)
+        top, total = sums.get(title_id, (exponent, 0.0))
+        if exponent > top:
+            total *= math.exp(top - exponent)
+            top = exponent
+        sums[title_id] = (top, total + math.exp(exponent - top))
+    return {
+        title_id: top + math.log(total)
+        for title_id, (top, total) in sums.items()
+    }
+
+
+def rank_titles(queryset, ranking):
+    """Оставляет произведения подборки и упорядочивает их."""
+    condition, ordering = RANKINGS[ranking]
+    return queryset.filter(**condition).order_by(*ordering)
@@ -0,0 +1,109 @@
+"""
+Полнотекстовый поиск произведений по названию.
+
+В PostgreSQL поиск идёт по GIN-индексам на to_tsvector('simple', name)
+(префиксный поиск по словам) и gin_trgm_ops (поиск с опечатками),
+в SQLite - по виртуальной таблице FTS5, которая обновляется при
+сохранении произведения. Индексы создаёт миграция 0005_title_search.
+"""
+import re
+
+from django.contrib.postgres.search import (SearchQuery, SearchRank,
+                                            SearchVector, TrigramSimilarity)
+from django.db import connection
+from django.db.models import F, FloatField, Q
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Greatest
+
+SEARCH_CONFIG = 'simple'
+FTS_TABLE = 'reviews_title_fts'
+
+
+def search_terms(query):
+    return re.findall(r'\w+', query.lower())
+
+
+def index_title(title):
+    """Обновляет запись произведения в FTS5; в PostgreSQL не нужно."""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s',
+                       [title.pk])
+        cursor.execute(f'INSERT INTO {FTS_TABLE}(rowid, name) '
+                       'VALUES (%s, %s)', [title.pk, title.name])
+
+
+def unindex_title(title):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s',
+                       [title.pk])
+
+
+def rebuild_index():
+    """Перестраивает FTS5 после массовых вставок в обход save()."""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        cursor.execute(f'INSERT INTO {FTS_TABLE}(rowid, name) '
+                       'SELECT id, name FROM reviews_title')
+
+
+def search_titles(queryset, query):
+    """
+    Оставляет в queryset произведения, подходящие под запрос, и сортирует
+    их по релевантности. Каждое слово запроса ищется как префикс.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return queryset.none()
+    if connection.vendor == 'postgresql':
+        return _search_postgresql(queryset, query, terms)
+    if connection.vendor == 'sqlite':
+        return _search_sqlite(queryset, terms)
+    condition = Q()
+    for term in terms:
+        condition &= Q(name__icontains=term)
+    return queryset.filter(condition)
+
+
+def _search_postgresql(queryset, query, terms):
+    search_query = SearchQuery(
+        ' & '.join(f'{term}:*' for term in terms),
+        config=SEARCH_CONFIG,
+        search_type='raw'
+    )
+    return queryset.annotate(
+        search=SearchVector('name', config=SEARCH_CONFIG),
+        similarity=TrigramSimilarity('name', query),
+    ).filter(
+        Q(search=search_query) | Q(name__trigram_similar=query)
+    ).annotate(
+        rank=Greatest(
+            SearchRank(F('search'), search_query),
+            F('similarity'),
+            output_field=FloatField()
+        )
+    ).order_by('-rank', 'id')
+
+
+def _search_sqlite(queryset, terms):
+    match = ' AND '.join('"{}"*'.format(term) for term in terms)
+    # pk__in=RawSQL(...) даёт IN ((SELECT ...)), что SQLite читает как
+    # список из одного значения, поэтому условие задаётся через extra().
+    return queryset.extra(
+        where=[f'"reviews_title"."id" IN (SELECT rowid FROM {FTS_TABLE} '
+               f'WHERE {FTS_TABLE} MATCH %s)'],
+        params=[match]
+    ).annotate(
+        rank=RawSQL(
+            f'SELECT -bm25({FTS_TABLE}) FROM {FTS_TABLE} '
+            f'WHERE {FTS_TABLE} MATCH %s '
+            f'AND rowid = "reviews_title"."id"',
+            [match],
+            output_field=FloatField()
+        )
+    ).order_by('-rank', 'id')
@@ -0,0 +1,83 @@
+from django.db.models import DEFERRED
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import search
+from .deletion import pop_pending
+from .models import Comment, Review, Title
+from .ranking import sum_trending, trending_exponent
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_review_save(sender, instance, created, raw, **kwargs):
+    """
+    Новый отзыв сдвигает сохранённый рейтинг и популярность произведения,
+    изменённый - сдвигает рейтинг на разницу со старой оценкой. Если
+    старая оценка неизвестна или отзыв перенесён к другому произведению,
+    рейтинг пересчитывается по отзывам.
+    """
+    if raw:
+        return
+    titles = Title.objects.filter(pk=instance.title_id)
+    title_id, score = getattr(instance, 'loaded_rating', (None, None))
+    if created:
+        titles.update_rating(instance.score, 1,
+                             trending_exponent(instance.pub_date))
+    elif title_id == instance.title_id and score is not DEFERRED:
+        if instance.score != score:
+            titles.update_rating(instance.score - score, 0)
+    else:
+        titles.recalculate_rating()
+        if title_id not in (None, DEFERRED, instance.title_id):
+            Title.objects.filter(pk=title_id).recalculate_rating()
+    instance.loaded_rating = (instance.title_id, instance.score)
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_review_delete(sender, instance, **kwargs):
+    """
+    Удалённые отзывы вычитаются из сохранённого рейтинга и популярности
+    произведения одним UPDATE на произведение. Если произведение
+    удаляется вместе с ними, вычитать не из чего.
+    """
+    reviews = pop_pending(Title, instance.title_id)
+    if reviews:
+        Title.objects.filter(pk=instance.title_id).update_rating(
+            -sum(review.score for review in reviews), -len(reviews),
+            sum_trending(
+                (review.title_id, review.pub_date) for review in reviews
+            )[instance.title_id]
+        )
+
+
+@receiver(post_save, sender=Comment)
+def update_comments_count_on_save(sender, instance, created, raw, **kwargs):
+    """Новый комментарий увеличивает сохранённое число комментариев."""
+    if created and not raw:
+        Review.objects.filter(
+            pk=instance.review_id
+        ).update_comments_count(1)
+
+
+@receiver(post_delete, sender=Comment)
+def update_comments_count_on_delete(sender, instance, **kwargs):
+    """
+    Удалённые комментарии вычитаются из числа комментариев отзыва одним
+    UPDATE на отзыв, если сам отзыв не удаляется вместе с ними.
+    """
+    comments = pop_pending(Review, instance.review_id)
+    if comments:
+        Review.objects.filter(
+            pk=instance.review_id
+        ).update_comments_count(-len(comments))
+
+
+@receiver(post_save, sender=Title)
+def index_title_on_save(sender, instance, raw, **kwargs):
+    """Поисковый индекс названия обновляется вместе с произведением."""
+    search.index_title(instance)
+
+
+@receiver(post_delete, sender=Title)
+def unindex_title_on_delete(sender, instance, **kwargs):
+    search.unindex_title(instance)
@@ -4,7 +4,7 @@ from django.contrib.auth.admin import UserAdmin
 from api_yamdb.settings import EMPTY_VALUE_DISPLAY
 
 from .forms import CustomUserChangeForm, CustomUserCreationForm
-from .models import CustomUser
+from .models import CustomUser, OutgoingEmail
 
 
 @admin.register(CustomUser)
@@ -22,3 +22,12 @@ class CustomUserAdmin(UserAdmin):
     search_fields = ('username',)
     list_filter = ('username',)
     empty_value_display = EMPTY_VALUE_DISPLAY
+
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'recipient', 'subject', 'created',
+                    'attempts', 'next_attempt_at', 'sent_at')
+    search_fields = ('recipient',)
+    list_filter = ('sent_at',)
+    empty_value_display = EMPTY_VALUE_DISPLAY
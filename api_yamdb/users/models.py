@@ -1,5 +1,7 @@
 from django.contrib.auth.models import AbstractUser
+from django.db import models
 from django.db.models import CharField, EmailField, TextField
+from django.utils import timezone
 
 
 class CustomUser(AbstractUser):
@@ -43,3 +45,37 @@ class CustomUser(AbstractUser):
 
     def __str__(self) -> str:
         return self.username
+
+
+class OutgoingEmail(models.Model):
+    """
+    Письмо в очереди на отправку. Запрос только сохраняет запись,
+    а отправляет её команда send_emails в отдельном процессе.
+    """
+    subject = models.CharField('Тема', max_length=255)
+    message = models.TextField('Текст')
+    from_email = models.CharField('Отправитель', max_length=254)
+    recipient = models.EmailField('Получатель')
+    created = models.DateTimeField('Создано', auto_now_add=True)
+    next_attempt_at = models.DateTimeField(
+        'Следующая попытка',
+        default=timezone.now
+    )
+    attempts = models.PositiveSmallIntegerField('Попытки', default=0)
+    sent_at = models.DateTimeField('Отправлено', blank=True, null=True)
+    last_error = models.TextField('Последняя ошибка', blank=True)
+
+    class Meta:
+        ordering = ('id',)
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+        indexes = [
+            models.Index(
+                fields=('next_attempt_at',),
+                name='outgoing_email_pending_idx',
+                condition=models.Q(sent_at__isnull=True)
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.recipient}: {self.subject}'
@@ -0,0 +1,92 @@
+from datetime import timedelta
+
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutgoingEmail
+
+RETRY_DELAY = timedelta(minutes=1)
+MAX_RETRY_DELAY = timedelta(hours=6)
+
+
+def enqueue_email(subject, message, from_email, recipient):
+    """Ставит письмо в очередь; отправит его команда send_emails."""
+    return OutgoingEmail.objects.create(
+        subject=subject,
+        message=message,
+        from_email=from_email,
+        recipient=recipient
+    )
+
+
+def retry_delay(attempts):
+    """Экспоненциальная задержка перед следующей попыткой."""
+    return min(RETRY_DELAY * 2 ** (attempts - 1), MAX_RETRY_DELAY)
+
+
+def claim_batch(batch_size, max_attempts, now):
+    """
+    Забирает до batch_size готовых писем. Строки блокируются с SKIP
+    LOCKED, поэтому несколько обработчиков не возьмут одно письмо дважды.
+    Попытка засчитывается и следующая назначается с задержкой сразу,
+    до фиксации: если отправка не вернёт результат (обработчик упал),
+    письмо повторится в срок, а не зависнет.
+    """
+    with transaction.atomic():
+        emails = list(
+            OutgoingEmail.objects.select_for_update(skip_locked=True).filter(
+                sent_at__isnull=True,
+                next_attempt_at__lte=now,
+                attempts__lt=max_attempts
+            ).order_by('next_attempt_at')[:batch_size]
+        )
+        for email in emails:
+            email.attempts += 1
+            email.next_attempt_at = now + retry_delay(email.attempts)
+        OutgoingEmail.objects.bulk_update(emails,
+                                          ('attempts', 'next_attempt_at'))
+    return emails
+
+
+def send_batch(batch_size, max_attempts):
+    """
+    Отправляет до batch_size готовых писем через одно SMTP-соединение.
+    SMTP работает вне транзакции: блокировки держатся только на время
+    захвата писем. Если соединение не открылось, ошибку получают все
+    письма пачки и повторяются с задержкой. Возвращает (отправлено,
+    ошибок).
+    """
+    emails = claim_batch(batch_size, max_attempts, timezone.now())
+    if not emails:
+        return 0, 0
+    sent = failed = 0
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as error:
+        for email in emails:
+            email.last_error = repr(error)
+        failed = len(emails)
+    else:
+        try:
+            for email in emails:
+                try:
+                    EmailMessage(
+                        subject=email.subject,
+                        body=email.message,
+                        from_email=email.from_email,
+                        to=(email.recipient,),
+                        connection=connection
+                    ).send()
+                except Exception as error:
+                    email.last_error = repr(error)
+                    failed += 1
+                else:
+                    email.sent_at = timezone.now()
+                    email.last_error = ''
+                    sent += 1
+        finally:
+            connection.close()
+    OutgoingEmail.objects.bulk_update(emails, ('sent_at', 'last_error'))
+    return sent, failed
@@ -0,0 +1,114 @@
+import os
+import random
+
+import pytest
+
+BENCHMARK_SCALE = float(os.getenv('BENCHMARK_SCALE', '1'))
+# Проверки времени зависят от машины и на общих раннерах CI случайно
+# падают, поэтому включаются явно.
+RUN_BENCHMARKS = os.getenv('BENCHMARKS', '').lower() in ('1', 'true')
+
+
+def pytest_collection_modifyitems(config, items):
+    if RUN_BENCHMARKS:
+        return
+    skip = pytest.mark.skip(reason='замеры времени включает BENCHMARKS=1')
+    for item in items:
+        if item.get_closest_marker('benchmark'):
+            item.add_marker(skip)
+
+
+def scaled(value):
+    return max(int(value * BENCHMARK_SCALE), 1)
+
+
+def seed_dataset(seed=2022):
+    """
+    Заполняет базу синтетическими данными пачками bulk_create.
+    При BENCHMARK_SCALE=1 - 300 произведений, 3000 отзывов и комментариев.
+    """
+    from django.contrib.auth import get_user_model
+
+    from reviews import search
+    from reviews.models import Categories, Comment, Genre, Review, Title
+
+    randomizer = random.Random(seed)
+    user_model = get_user_model()
+    user_model.objects.bulk_create(
+        user_model(id=index, username=f'bench{index}',
+                   email=f'bench{index}@yamdb.fake',
+                   role=randomizer.choice(('user', 'moderator', 'admin')))
+        for index in range(1, scaled(60) + 1)
+    )
+    Categories.objects.bulk_create(
+        Categories(id=index, name=f'Категория {index}', slug=f'cat-{index}')
+        for index in range(1, 11)
+    )
+    Genre.objects.bulk_create(
+        Genre(id=index, name=f'Жанр {index}', slug=f'genre-{index}')
+        for index in range(1, 21)
+    )
+    title_ids = range(1001, 1001 + scaled(300))
+    Title.objects.bulk_create(
+        Title(id=title_id, name=f'Произведение {title_id}',
+              year=randomizer.randint(1950, 2020),
+              category_id=randomizer.randint(1, 10))
+        for title_id in title_ids
+    )
+    Title.genre.through.objects.bulk_create(
+        Title.genre.through(title_id=title_id, genre_id=genre_id)
+        for title_id in title_ids
+        for genre_id in randomizer.sample(range(1, 21), 3)
+    )
+    users = range(1, scaled(60) + 1)
+    reviews = []
+    for title_id in title_ids:
+        for author_id in randomizer.sample(users, min(len(users), 10)):
+            reviews.append(Review(
+                id=len(reviews) + 1, title_id=title_id, author_id=author_id,
+                text='Отзыв ' * 20, score=randomizer.randint(1, 10)
+            ))
+    Review.objects.bulk_create(reviews, batch_size=500)
+    Comment.objects.bulk_create(
+        (Comment(review_id=review.id, title_id=review.title_id,
+                 author_id=randomizer.choice(users), text='Комментарий')
+         for review in reviews),
+        batch_size=500
+    )
+    # bulk_create не вызывает сигналы: счётчики и подборки считаются
+    # заново, иначе списки по сохранённым счётчикам оказались бы пустыми.
+    Title.objects.recalculate_rating()
+    Title.objects.recalculate_trending()
+    Review.objects.recalculate_comments_count()
+    search.rebuild_index()
+
+
+@pytest.fixture(scope='module')
+def benchmark_dataset(django_db_setup, django_db_blocker):
+    from django.core.management import call_command
+
+    with django_db_blocker.unblock():
+        seed_dataset()
+        yield
+        call_command('flush', interactive=False, verbosity=0)
+
+
+@pytest.fixture(scope='module')
+def bench_client(benchmark_dataset, django_db_blocker):
+    from django.contrib.auth import get_user_model
+    from rest_framework.test import APIClient
+
+    from api.authentication import UserClaimsRefreshToken
+
+    with django_db_blocker.unblock():
+        admin = get_user_model().objects.create_user(
+            username='bench-admin', email='bench-admin@yamdb.fake',
+            role='admin'
+        )
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION='Bearer {}'.format(
+            UserClaimsRefreshToken.for_user(admin).access_token
+        )
+    )
+    return client
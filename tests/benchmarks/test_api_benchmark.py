@@ -0,0 +1,116 @@
+"""
+Нагрузочный прогон всех маршрутов router_v1 на синтетических данных.
+Для каждого маршрута замеряются p50/p95 времени ответа, число запросов
+к базе и пик выделенной памяти; тест падает, если маршрут вышел за
+бюджет из ENDPOINT_BUDGETS. Размер данных задаёт BENCHMARK_SCALE.
+Бюджет p95 проверяется только при BENCHMARKS=1.
+"""
+import statistics
+import time
+import tracemalloc
+
+import pytest
+from django.db import connection, reset_queries
+from django.test.utils import CaptureQueriesContext
+
+from api.urls import router_v1
+
+from .conftest import RUN_BENCHMARKS
+
+ITERATIONS = 20
+TITLE_ID = 1001
+REVIEW_ID = 1
+
+# prefix маршрута -> (url, запросов к БД, p95 в мс, пик памяти в КиБ).
+# Запросы считаются для администратора после разогревающего запроса:
+# ответы анонимам кешируются, а пользователь берётся из токена.
+ENDPOINT_BUDGETS = {
+    'categories': ('/api/v1/categories/', 2, 150, 512),
+    'genres': ('/api/v1/genres/', 2, 150, 512),
+    'titles': ('/api/v1/titles/', 3, 200, 1024),
+    'titles/(?P<title_id>\\d+)/reviews': (
+        f'/api/v1/titles/{TITLE_ID}/reviews/', 3, 200, 1024
+    ),
+    'titles/(?P<title_id>\\d+)/reviews/(?P<review_id>\\d+)/comments': (
+        f'/api/v1/titles/{TITLE_ID}/reviews/{REVIEW_ID}/comments/',
+        3, 200, 1024
+    ),
+    'users': ('/api/v1/users/', 2, 150, 512),
+}
+DETAIL_BUDGETS = {
+    'title detail': (f'/api/v1/titles/{TITLE_ID}/', 2, 150, 512),
+    'review detail': (
+        f'/api/v1/titles/{TITLE_ID}/reviews/{REVIEW_ID}/', 2, 150, 512
+    ),
+    'titles search': ('/api/v1/titles/?search=произведение', 3, 300, 1024),
+    'titles filtered': ('/api/v1/titles/?genre=genre-1&year=2000',
+                        3, 200, 1024),
+    'users me': ('/api/v1/users/me/', 1, 150, 512),
+}
+BUDGETS = {**ENDPOINT_BUDGETS, **DETAIL_BUDGETS}
+
+
+def percentile(values, share):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * share), len(ordered) - 1)]
+
+
+def measure(client, url):
+    latencies = []
+    query_counts = []
+    data = client.get(url).json()
+    assert data.get('results', True), f'{url}: пустой список'
+    for _ in range(ITERATIONS):
+        reset_queries()
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = client.get(url)
+            latencies.append((time.perf_counter() - started) * 1000)
+        query_counts.append(len(queries.captured_queries))
+        assert response.status_code == 200, f'{url}: {response.status_code}'
+    tracemalloc.start()
+    client.get(url)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        'p50': statistics.median(latencies),
+        'p95': percentile(latencies, 0.95),
+        'queries': max(query_counts),
+        'peak_kib': peak / 1024,
+    }
+
+
+class TestApiBenchmark:
+
+    def test_every_route_has_budget(self):
+        prefixes = {prefix for prefix, _, _ in router_v1.registry}
+        assert prefixes == set(ENDPOINT_BUDGETS), (
+            'Добавьте бюджет в ENDPOINT_BUDGETS для каждого маршрута '
+            'router_v1'
+        )
+
+    @pytest.mark.parametrize('name', BUDGETS)
+    def test_endpoint_within_budget(self, name, bench_client,
+                                    django_db_blocker, capsys):
+        url, max_queries, max_p95, max_peak = BUDGETS[name]
+        with django_db_blocker.unblock():
+            result = measure(bench_client, url)
+        with capsys.disabled():
+            print(
+                f'\n{url:<50.50} p50 {result["p50"]:7.2f} ms  '
+                f'p95 {result["p95"]:7.2f} ms  '
+                f'queries {result["queries"]:>2}  '
+                f'peak {result["peak_kib"]:7.1f} KiB'
+            )
+        assert result['queries'] <= max_queries, (
+            f'{name}: {result["queries"]} запросов к БД, '
+            f'бюджет {max_queries}'
+        )
+        if RUN_BENCHMARKS:
+            assert result['p95'] <= max_p95, (
+                f'{name}: p95 {result["p95"]:.1f} мс, бюджет {max_p95} мс'
+            )
+        assert result['peak_kib'] <= max_peak, (
+            f'{name}: пик памяти {result["peak_kib"]:.0f} КиБ, '
+            f'бюджет {max_peak} КиБ'
+        )
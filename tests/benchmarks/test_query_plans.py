@@ -0,0 +1,96 @@
+"""
+Планы запросов основных эндпоинтов на синтетических данных: ни один
+запрос не должен читать большие таблицы полным проходом без индекса
+или полным проходом по постороннему индексу с сортировкой всех строк.
+"""
+import re
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+TITLE_ID = 1001
+REVIEW_ID = 1
+LARGE_TABLES = {'reviews_title', 'reviews_title_genre', 'review',
+                'reviews_comment', 'users_customuser'}
+ENDPOINTS = {
+    'titles': '/api/v1/titles/',
+    'titles by genre': '/api/v1/titles/?genre=genre-1',
+    'titles by category': '/api/v1/titles/?category=cat-1',
+    'titles by year': '/api/v1/titles/?year=2000',
+    'top titles': '/api/v1/titles/top/',
+    'trending titles': '/api/v1/titles/trending/',
+    'title detail': f'/api/v1/titles/{TITLE_ID}/',
+    'reviews': f'/api/v1/titles/{TITLE_ID}/reviews/',
+    'reviews cursor': f'/api/v1/titles/{TITLE_ID}/reviews/?cursor=',
+    'review detail': f'/api/v1/titles/{TITLE_ID}/reviews/{REVIEW_ID}/',
+    'comments': f'/api/v1/titles/{TITLE_ID}/reviews/{REVIEW_ID}/comments/',
+}
+SQLITE_SCAN = re.compile(
+    r'^SCAN (?:TABLE )?(\w+)(?: AS \w+)?( USING (?:COVERING )?INDEX \w+)?$'
+)
+SQLITE_SORT = 'USE TEMP B-TREE FOR ORDER BY'
+POSTGRES_SCAN = re.compile(r'Seq Scan on (\w+)')
+
+
+def explain(sql):
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            return [row[-1] for row in cursor.fetchall()]
+        cursor.execute(f'EXPLAIN {sql}')
+        return [row[0] for row in cursor.fetchall()]
+
+
+def full_scans(plan):
+    """
+    Большие таблицы, которые план читает целиком без индекса. Проход
+    по индексу без условия допустим только без последующей сортировки:
+    так читается начало таблицы в нужном порядке или считается COUNT.
+    """
+    tables = set()
+    sorted_rows = any(SQLITE_SORT in line for line in plan)
+    for line in plan:
+        if connection.vendor == 'sqlite':
+            match = SQLITE_SCAN.match(line.strip())
+            if match and match.group(2) and not sorted_rows:
+                continue
+        else:
+            match = POSTGRES_SCAN.search(line)
+        if match and match.group(1) in LARGE_TABLES:
+            tables.add(match.group(1))
+    return tables
+
+
+@pytest.fixture(scope='module')
+def analyzed(benchmark_dataset, django_db_blocker):
+    with django_db_blocker.unblock(), connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+class TestQueryPlans:
+
+    @pytest.mark.parametrize('name', ENDPOINTS)
+    def test_no_full_scans(self, name, analyzed, bench_client,
+                           django_db_blocker):
+        if connection.vendor not in ('sqlite', 'postgresql'):
+            pytest.skip('Планы разбираются только для SQLite и PostgreSQL')
+        with django_db_blocker.unblock():
+            bench_client.get(ENDPOINTS[name])
+            with CaptureQueriesContext(connection) as queries:
+                response = bench_client.get(ENDPOINTS[name])
+            assert response.status_code == 200
+            assert response.json().get('results', True), (
+                f'{name}: пустой список'
+            )
+            plans = {
+                query['sql']: explain(query['sql'])
+                for query in queries.captured_queries
+                if query['sql'].startswith('SELECT')
+            }
+        assert plans, f'{name}: не выполнено ни одного SELECT'
+        for sql, plan in plans.items():
+            assert not full_scans(plan), (
+                f'{name}: полный проход по таблице без индекса\n'
+                f'{sql}\n' + '\n'.join(plan)
+            )
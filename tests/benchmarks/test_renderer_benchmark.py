@@ -0,0 +1,63 @@
+"""
+Рендеринг больших страниц произведений и отзывов: скорость стандартного
+JSONRenderer и FastJSONRenderer и размер ответа до и после gzip с теми же
+настройками, что в infra/nginx/default.conf.
+"""
+import gzip
+import time
+
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from api import renderers
+from api.renderers import FastJSONRenderer
+
+ROUNDS = 20
+GZIP_LEVEL = 5
+
+
+def throughput(renderer, data):
+    timings = []
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        body = renderer.render(data)
+        timings.append(time.perf_counter() - started)
+    return body, len(body) / min(timings) / 2 ** 20
+
+
+def page(name):
+    from api.fastlist import ValuesPlan
+    from api.serializers import ReviewSerializer, TitleSerializer
+    from reviews.models import Review, Title
+
+    serializer_class, queryset = {
+        'titles': (TitleSerializer, Title.objects.all()),
+        'reviews': (ReviewSerializer, Review.objects.all()),
+    }[name]
+    plan = ValuesPlan(queryset.model, serializer_class().fields)
+    results = plan.represent(list(queryset.values(*plan.columns)))
+    return {'count': len(results), 'next': None, 'previous': None,
+            'results': results}
+
+
+@pytest.mark.benchmark
+class TestRendererBenchmark:
+
+    @pytest.mark.parametrize('name', ('titles', 'reviews'))
+    def test_renderer_throughput(self, name, benchmark_dataset,
+                                 django_db_blocker, capsys):
+        if renderers.orjson is None:
+            pytest.skip('orjson не установлен')
+        with django_db_blocker.unblock():
+            data = page(name)
+        stdlib_body, stdlib_speed = throughput(JSONRenderer(), data)
+        fast_body, fast_speed = throughput(FastJSONRenderer(), data)
+        compressed = gzip.compress(fast_body, GZIP_LEVEL)
+        with capsys.disabled():
+            print(f'\n{name:<8} json {stdlib_speed:7.1f} MiB/s  '
+                  f'orjson {fast_speed:7.1f} MiB/s  '
+                  f'body {len(fast_body) / 1024:7.1f} KiB  '
+                  f'gzip {len(compressed) / 1024:6.1f} KiB')
+        assert fast_body == stdlib_body
+        assert fast_speed > stdlib_speed
+        assert len(compressed) < len(fast_body) / 3
@@ -0,0 +1,72 @@
+"""
+Сериализация списков: ModelSerializer на экземплярах моделей против
+быстрого пути через values() на всём синтетическом наборе.
+"""
+import time
+
+import pytest
+
+ROUNDS = 5
+
+
+def best_time(callback):
+    timings = []
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        result = callback()
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def regular(serializer_class, queryset):
+    return serializer_class(queryset.all(), many=True).data
+
+
+def fast(serializer_class, queryset):
+    from api.fastlist import ValuesPlan
+
+    fields = serializer_class().fields
+    plan = ValuesPlan(queryset.model, fields)
+    return plan.represent(list(
+        queryset.prefetch_related(None).values(*plan.columns)
+    ))
+
+
+def querysets():
+    from api.serializers import (CommentSerializer, ReviewSerializer,
+                                 TitleSerializer)
+    from reviews.models import Comment, Review, Title
+
+    return {
+        'titles': (TitleSerializer, Title.objects.select_related(
+            'category').prefetch_related('genre')),
+        'reviews': (ReviewSerializer,
+                    Review.objects.select_related('author')),
+        'comments': (CommentSerializer,
+                     Comment.objects.select_related('author')),
+    }
+
+
+@pytest.mark.benchmark
+class TestSerializationBenchmark:
+
+    @pytest.mark.parametrize('name', ('titles', 'reviews', 'comments'))
+    def test_values_path_is_faster(self, name, benchmark_dataset,
+                                   django_db_blocker, capsys):
+        with django_db_blocker.unblock():
+            serializer_class, queryset = querysets()[name]
+            regular_time, regular_data = best_time(
+                lambda: regular(serializer_class, queryset)
+            )
+            fast_time, fast_data = best_time(
+                lambda: fast(serializer_class, queryset)
+            )
+        with capsys.disabled():
+            print(f'\n{name:<10} rows {len(fast_data):>5}  '
+                  f'serializer {regular_time * 1000:8.1f} ms  '
+                  f'values {fast_time * 1000:8.1f} ms  '
+                  f'x{regular_time / fast_time:.1f}')
+        assert fast_data == regular_data
+        assert fast_time < regular_time, (
+            f'{name}: быстрый путь медленнее сериализатора'
+        )
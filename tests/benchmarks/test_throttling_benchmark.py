@@ -0,0 +1,62 @@
+import pickle
+import time
+
+import pytest
+from rest_framework import throttling
+from rest_framework.test import APIRequestFactory
+
+from api.throttling import UserRateThrottle
+
+REQUESTS = 2000
+RATE = '1000/day'
+
+
+class FakeUser:
+    is_authenticated = True
+    pk = 7
+
+
+def per_request_cost(throttle_class):
+    """
+    Среднее время allow_request в микросекундах при лимите 1000/day
+    после REQUESTS запросов одного пользователя и размер его состояния.
+    """
+    from django.core.cache import cache
+
+    cache.clear()
+    throttle_class.rate = RATE
+    request = APIRequestFactory().get('/')
+    request.user = FakeUser()
+    started = time.perf_counter()
+    for _ in range(REQUESTS):
+        throttle_class().allow_request(request, None)
+    elapsed = time.perf_counter() - started
+    state = sum(
+        len(pickle.dumps(cache.get(key.split(':', 2)[-1])))
+        for key in cache._cache
+    )
+    return elapsed / REQUESTS * 1e6, state
+
+
+@pytest.mark.benchmark
+class TestThrottleBenchmark:
+
+    def test_sliding_window_is_cheaper_than_stock(self, capsys):
+        class StockThrottle(throttling.UserRateThrottle):
+            pass
+
+        class SlidingThrottle(UserRateThrottle):
+            pass
+
+        stock_us, stock_state = per_request_cost(StockThrottle)
+        sliding_us, sliding_state = per_request_cost(SlidingThrottle)
+        with capsys.disabled():
+            print(
+                f'\nthrottle per request: stock {stock_us:.1f} us '
+                f'({stock_state} B state), sliding {sliding_us:.1f} us '
+                f'({sliding_state} B state)'
+            )
+        assert sliding_state < stock_state / 100
+        assert sliding_us < stock_us, (
+            'Проверьте, что скользящее окно дешевле стандартного ограничения'
+        )
@@ -0,0 +1,170 @@
+"""
+Пропускная способность gunicorn при медленных клиентах: синхронные
+воркеры против gthread из gunicorn.conf.py. Сервер поднимается
+отдельным процессом на файле SQLite с синтетическими данными, клиенты
+обращаются к нему напрямую, без буферизации nginx.
+"""
+import http.client
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from .conftest import scaled
+
+pytest.importorskip('gunicorn')
+
+PROJECT_DIR = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__))
+)), 'api_yamdb')
+WORKERS = 2
+THREADS = 8
+SLOW_CLIENTS = 4
+FAST_CLIENTS = 8
+DURATION = 3
+USERS = 50
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture(scope='module')
+def server_env(tmp_path_factory):
+    path = tmp_path_factory.mktemp('workers') / 'yamdb.sqlite3'
+    env = dict(
+        os.environ,
+        DB_ENGINE='django.db.backends.sqlite3',
+        DB_NAME=str(path),
+        CACHE_BACKEND='django.core.cache.backends.locmem.LocMemCache',
+    )
+    for command in (
+        ['migrate', '--verbosity', '0'],
+        ['generate_dataset', '--users', str(USERS),
+         '--titles', str(scaled(200)), '--reviews', str(scaled(2000)),
+         '--comments', str(scaled(2000))],
+    ):
+        subprocess.run([sys.executable, 'manage.py', *command],
+                       cwd=PROJECT_DIR, env=env, check=True,
+                       stdout=subprocess.DEVNULL)
+    return env
+
+
+def start_server(env, worker_class, threads):
+    port = free_port()
+    process = subprocess.Popen(
+        # У gunicorn 20.0 нет __main__ для запуска через -m.
+        [sys.executable, '-c', 'from gunicorn.app.wsgiapp import run; run()',
+         'api_yamdb.wsgi:application', '--config', 'gunicorn.conf.py'],
+        cwd=PROJECT_DIR,
+        env=dict(env, GUNICORN_BIND=f'127.0.0.1:{port}',
+                 GUNICORN_WORKER_CLASS=worker_class,
+                 GUNICORN_WORKERS=str(WORKERS),
+                 GUNICORN_THREADS=str(threads)),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            get(port, '/api/v1/categories/')
+            return process, port
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    pytest.fail(f'gunicorn ({worker_class}) не запустился')
+
+
+def get(port, path):
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    try:
+        connection.request('GET', path)
+        response = connection.getresponse()
+        response.read()
+        return response.status
+    finally:
+        connection.close()
+
+
+def slow_client(port, stop):
+    """Присылает заголовки запроса по байту, пока не истечёт замер."""
+    with socket.create_connection(('127.0.0.1', port)) as sock:
+        sock.sendall(b'GET /api/v1/titles/ HTTP/1.1\r\nHost: yamdb\r\n')
+        while not stop.is_set():
+            sock.sendall(b'X')
+            stop.wait(0.1)
+
+
+def fast_client(port, paths, stop, latencies):
+    index = 0
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            status = get(port, paths[index % len(paths)])
+        except OSError:
+            continue
+        if status == 200 and not stop.is_set():
+            latencies.append(time.perf_counter() - started)
+        index += 1
+
+
+def measure(env, worker_class, threads=1):
+    """Запросов в секунду и p95 в мс у быстрых клиентов рядом с медленными."""
+    process, port = start_server(env, worker_class, threads)
+    title = USERS + 1
+    paths = ['/api/v1/titles/', f'/api/v1/titles/{title}/',
+             f'/api/v1/titles/{title}/reviews/']
+    stop = threading.Event()
+    latencies = []
+    try:
+        threads = [
+            threading.Thread(target=slow_client, args=(port, stop))
+            for _ in range(SLOW_CLIENTS)
+        ]
+        # Медленные клиенты успевают занять воркеры до быстрых.
+        for thread in threads:
+            thread.start()
+        time.sleep(0.5)
+        fast = [
+            threading.Thread(target=fast_client,
+                             args=(port, paths, stop, latencies))
+            for _ in range(FAST_CLIENTS)
+        ]
+        for thread in fast:
+            thread.start()
+        time.sleep(DURATION)
+        stop.set()
+        for thread in threads + fast:
+            thread.join(timeout=35)
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95)] * 1000 if latencies else None
+    return len(latencies) / DURATION, p95
+
+
+@pytest.mark.benchmark
+class TestWorkerBenchmark:
+
+    def test_gthread_serves_fast_clients_next_to_slow_ones(self, server_env,
+                                                           capsys):
+        # С threads больше 1 gunicorn сам заменяет sync на gthread.
+        sync_rps, sync_p95 = measure(server_env, 'sync')
+        gthread_rps, gthread_p95 = measure(server_env, 'gthread', THREADS)
+        with capsys.disabled():
+            print(
+                f'\n{SLOW_CLIENTS} slow + {FAST_CLIENTS} fast clients, '
+                f'{WORKERS} workers: sync {sync_rps:.0f} req/s '
+                f'(p95 {sync_p95 or 0:.0f} ms), gthread x{THREADS} '
+                f'{gthread_rps:.0f} req/s (p95 {gthread_p95 or 0:.0f} ms)'
+            )
+        assert gthread_rps > sync_rps * 2, (
+            'Проверьте, что воркеры gthread не простаивают из-за медленных '
+            'клиентов'
+        )
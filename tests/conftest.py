@@ -1,9 +1,74 @@
+import copy
 import sys
+from threading import local
 from os.path import abspath, dirname, join
 
+import pytest
+
 root_dir = dirname(dirname(abspath(__file__)))
 sys.path.append(root_dir)
 infra_dir_path = join(root_dir, 'infra')
 
+TEST_DATABASE = {
+    'ENGINE': 'django.db.backends.sqlite3',
+    'NAME': ':memory:',
+}
+TEST_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
 pytest_plugins = [
+    'tests.fixtures.fixture_user',
+    'tests.fixtures.fixture_data',
 ]
+
+
+@pytest.fixture(scope='session')
+def django_db_modify_db_settings(django_db_modify_db_settings_parallel_suffix):
+    """
+    Тесты с базой данных работают на SQLite в памяти, а кеш - в памяти
+    процесса, чтобы не требовать запущенных PostgreSQL и memcached.
+    Модуль настроек при этом не меняется.
+    """
+    from django.conf import settings
+    from django.db import connections
+
+    settings.CACHES = TEST_CACHES
+    databases = copy.deepcopy(settings.DATABASES)
+    databases['default'] = dict(TEST_DATABASE)
+    settings.DATABASES = databases
+    connections._databases = None
+    connections.__dict__.pop('databases', None)
+    connections._connections = local()
+
+
+@pytest.fixture(autouse=True)
+def locmem_cache(settings):
+    """Каждый тест получает пустой кеш в памяти процесса."""
+    from django.core.cache import cache
+
+    settings.CACHES = TEST_CACHES
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def local_lookups():
+    """Копии справочников в памяти процесса не переходят между тестами."""
+    from api.lookups import TABLE_CACHES
+
+    for table in TABLE_CACHES.values():
+        table.clear()
+    yield TABLE_CACHES
+    for table in TABLE_CACHES.values():
+        table.clear()
+
+
+@pytest.fixture
+def warm_lookups(titles, local_lookups):
+    """Справочники уже загружены в память, как в работающем воркере."""
+    for table in local_lookups.values():
+        table.get()
@@ -0,0 +1,61 @@
+import pytest
+
+
+@pytest.fixture
+def categories(db):
+    from reviews.models import Categories
+
+    return [
+        Categories.objects.create(name='Фильм', slug='movie'),
+        Categories.objects.create(name='Книга', slug='book'),
+    ]
+
+
+@pytest.fixture
+def genres(db):
+    from reviews.models import Genre
+
+    return [
+        Genre.objects.create(name='Драма', slug='drama'),
+        Genre.objects.create(name='Комедия', slug='comedy'),
+        Genre.objects.create(name='Фантастика', slug='sci-fi'),
+    ]
+
+
+@pytest.fixture
+def titles(categories, genres):
+    """
+    Произведения создаются после пользователей из других фикстур не всегда,
+    поэтому их id начинаются с 100: это не даёт сработать ограничению
+    author_not_title_again на случайном совпадении id.
+    """
+    from reviews.models import Title
+
+    result = []
+    for index in range(6):
+        title = Title.objects.create(
+            id=100 + index,
+            name=f'Произведение {index}',
+            year=1990 + index,
+            description=f'Описание {index}',
+            category=categories[index % len(categories)]
+        )
+        title.genre.set(genres[:index % len(genres) + 1])
+        result.append(title)
+    return result
+
+
+@pytest.fixture
+def title(titles):
+    return titles[0]
+
+
+@pytest.fixture
+def reviews(title, admin, moderator, user):
+    from reviews.models import Review
+
+    return [
+        Review.objects.create(title=title, author=author, text='Отзыв',
+                              score=score)
+        for author, score in ((admin, 10), (moderator, 7), (user, 4))
+    ]
@@ -0,0 +1,66 @@
+import pytest
+
+from api.authentication import UserClaimsRefreshToken
+
+
+def client_for(user):
+    from rest_framework.test import APIClient
+
+    client = APIClient()
+    token = UserClaimsRefreshToken.for_user(user).access_token
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client
+
+
+@pytest.mark.django_db
+class TestClaimsAuthentication:
+
+    def test_token_carries_claims(self, user):
+        token = UserClaimsRefreshToken.for_user(user).access_token
+        assert token['username'] == user.username
+        assert token['role'] == 'user'
+        assert token['is_superuser'] is False
+
+    def test_authenticated_request_skips_user_query(
+            self, admin, django_assert_num_queries):
+        client = client_for(admin)
+        # Пагинация и страница пользователей, без чтения самого admin.
+        with django_assert_num_queries(2):
+            response = client.get('/api/v1/users/')
+        assert response.status_code == 200
+
+    def test_me_loads_user_once(self, user, django_assert_num_queries):
+        client = client_for(user)
+        with django_assert_num_queries(1):
+            response = client.get('/api/v1/users/me/')
+        assert response.json()['email'] == user.email
+        response = client.patch('/api/v1/users/me/', data={'bio': 'Новое'})
+        assert response.json()['bio'] == 'Новое'
+        user.refresh_from_db()
+        assert user.bio == 'Новое' and user.email == 'testuser@yamdb.fake'
+
+    def test_role_change_forces_reload(self, admin):
+        client = client_for(admin)
+        assert client.get('/api/v1/users/').status_code == 200
+        admin.role = 'user'
+        admin.save()
+        assert client.get('/api/v1/users/').status_code == 403, (
+            'Проверьте, что смена роли действует на уже выданные токены'
+        )
+
+    def test_deactivated_user_is_rejected(self, user):
+        client = client_for(user)
+        assert client.get('/api/v1/users/me/').status_code == 200
+        user.is_active = False
+        user.save()
+        assert client.get('/api/v1/users/me/').status_code == 401
+
+    def test_author_permissions_with_token_user(self, title, user):
+        client = client_for(user)
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        review_id = client.post(url, data={'text': 'Отзыв', 'score': 5}
+                                ).json()['id']
+        response = client.patch(f'{url}{review_id}/', data={'score': 6})
+        assert response.status_code == 200, (
+            'Проверьте, что автор может править свой отзыв'
+        )
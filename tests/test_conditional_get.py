@@ -0,0 +1,64 @@
+import pytest
+
+from reviews.models import Comment
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+
+    def test_unchanged_title_returns_304_without_queries(
+            self, title, anon_client, django_assert_num_queries):
+        url = f'/api/v1/titles/{title.id}/'
+        response = anon_client.get(url)
+        etag = response['ETag']
+        assert etag.startswith('W/"'), (
+            'Проверьте, что ответ на GET содержит слабый ETag'
+        )
+        with django_assert_num_queries(0):
+            response = anon_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        assert response['ETag'] == etag
+
+    def test_reviews_etag_changes_with_reviews(self, title, reviews, user,
+                                               user_client):
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        etag = user_client.get(url)['ETag']
+        assert user_client.get(url, HTTP_IF_NONE_MATCH=etag
+                               ).status_code == 304
+        review = reviews[2]
+        review.text = 'Исправленный отзыв'
+        review.save()
+        response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что изменение отзыва меняет ETag списка отзывов'
+        )
+        assert response['ETag'] != etag
+
+    def test_query_params_are_part_of_etag(self, title, reviews,
+                                           anon_client):
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        etag = anon_client.get(url)['ETag']
+        response = anon_client.get(f'{url}?cursor=', HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+
+    def test_comment_invalidates_comment_list(self, title, reviews, user,
+                                              anon_client):
+        review = reviews[0]
+        url = f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/'
+        response = anon_client.get(url)
+        etag, last_modified = response['ETag'], response['Last-Modified']
+        assert anon_client.get(
+            url, HTTP_IF_MODIFIED_SINCE=last_modified
+        ).status_code == 304, (
+            'Проверьте, что запрос с If-Modified-Since получает 304'
+        )
+        Comment.objects.create(review=review, author=user, text='Согласен')
+        response = anon_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response.json()['count'] == 1
+
+    def test_missing_object_is_not_cached(self, title, anon_client):
+        url = f'/api/v1/titles/{title.id}/reviews/999/'
+        response = anon_client.get(url)
+        assert response.status_code == 404
+        assert not response.has_header('ETag')
@@ -0,0 +1,143 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Comment, Review, Title
+
+
+def comments_url(review):
+    return (f'/api/v1/titles/{review.title_id}/reviews/{review.id}'
+            f'/comments/')
+
+
+@pytest.fixture
+def comments(reviews, admin, user):
+    """Два комментария к первому отзыву и один ко второму."""
+    return [
+        Comment.objects.create(review=review, author=author,
+                               text='Комментарий')
+        for review, author in ((reviews[0], admin), (reviews[0], user),
+                               (reviews[1], user))
+    ]
+
+
+def bulk_reviews(title, django_user_model, count):
+    """Отзывы с комментариями через bulk_create, в обход сигналов."""
+    prefix = f'bulk{title.id}-'
+    django_user_model.objects.bulk_create(
+        django_user_model(username=f'{prefix}{index}',
+                          email=f'{prefix}{index}@yamdb.fake')
+        for index in range(count)
+    )
+    Review.objects.bulk_create(
+        Review(title=title, author=author, text='Отзыв', score=5)
+        for author in django_user_model.objects.filter(
+            username__startswith=prefix
+        )
+    )
+    Comment.objects.bulk_create(
+        Comment(review=review, author_id=review.author_id,
+                text='Комментарий')
+        for review in Review.objects.filter(title=title)
+    )
+
+@pytest.mark.django_db
+class TestStoredCounters:
+
+    def test_counters_follow_api_writes(self, title, user_client):
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        review = user_client.post(url, data={'text': 'Отзыв',
+                                             'score': 6}).json()
+        url = f'{url}{review["id"]}/comments/'
+        comment = user_client.post(url, data={'text': 'Комментарий'}).json()
+        assert user_client.get(url).json()['count'] == 1
+        assert Review.objects.get(pk=review['id']).comments_count == 1, (
+            'Проверьте, что новый комментарий увеличивает comments_count'
+        )
+        user_client.delete(f'{url}{comment["id"]}/')
+        assert Review.objects.get(pk=review['id']).comments_count == 0, (
+            'Проверьте, что удалённый комментарий уменьшает comments_count'
+        )
+
+    def test_cascade_deletes_keep_counters(self, title, reviews, comments,
+                                           user):
+        user.delete()
+        title.refresh_from_db()
+        assert title.reviews_count == 2, (
+            'Проверьте, что отзывы удалённого пользователя вычитаются '
+            'из reviews_count'
+        )
+        assert list(Review.objects.values_list('comments_count', flat=True)
+                    ) == [1, 0], (
+            'Проверьте, что комментарии удалённого пользователя вычитаются '
+            'из comments_count'
+        )
+        title.delete()
+        assert not Comment.objects.exists()
+
+    def test_counters_in_responses(self, title, reviews, comments,
+                                   anon_client):
+        detail = anon_client.get(f'/api/v1/titles/{title.id}/').json()
+        assert detail['reviews_count'] == 3
+        listed = anon_client.get(f'/api/v1/titles/{title.id}/reviews/')
+        assert [item['comments_count'] for item in listed.json()['results']
+                ] == [2, 1, 0], (
+            'Проверьте, что список отзывов показывает comments_count'
+        )
+        # Новый комментарий виден и в закешированном списке отзывов.
+        Comment.objects.create(review=reviews[2], author=reviews[0].author,
+                               text='Ещё')
+        listed = anon_client.get(f'/api/v1/titles/{title.id}/reviews/')
+        assert listed.json()['results'][2]['comments_count'] == 1
+
+    def test_comment_list_count_is_stored(self, reviews, comments,
+                                          anon_client,
+                                          django_assert_num_queries):
+        # Отзыв из URL и страница комментариев, без COUNT(*).
+        with django_assert_num_queries(2) as context:
+            data = anon_client.get(comments_url(reviews[0])).json()
+        assert not any('COUNT(' in query['sql']
+                       for query in context.captured_queries)
+        assert (data['count'], data['count_exact']) == (2, True)
+
+    def test_reconcile_counters_command(self, title, reviews, comments):
+        Title.objects.update(reviews_count=0, rating=None)
+        Review.objects.update(comments_count=7)
+        call_command('reconcile_counters', '--dry-run')
+        assert Review.objects.filter(comments_count=7).count() == 3, (
+            'Проверьте, что --dry-run ничего не меняет'
+        )
+        call_command('reconcile_counters')
+        title.refresh_from_db()
+        assert (title.reviews_count, title.rating) == (3, pytest.approx(7)), (
+            'Проверьте, что команда reconcile_counters исправляет '
+            'reviews_count и рейтинг'
+        )
+        assert list(Review.objects.values_list('comments_count', flat=True)
+                    ) == [2, 1, 0]
+
+    def test_drifted_counters_do_not_block_deletes(self, title, reviews,
+                                                   django_user_model):
+        bulk_reviews(title, django_user_model, 5)
+        Review.objects.filter(title=title).delete()
+        title.refresh_from_db()
+        assert (title.reviews_count, title.rating_sum, title.rating) == (
+            0, 0, None
+        ), 'Проверьте, что счётчики не уходят ниже нуля'
+        title.delete()
+
+    def test_title_delete_does_not_touch_rows_one_by_one(
+            self, titles, django_user_model):
+        queries = []
+        for title, count in ((titles[0], 3), (titles[1], 30)):
+            bulk_reviews(title, django_user_model, count)
+            Title.objects.recalculate_rating()
+            Review.objects.recalculate_comments_count()
+            with CaptureQueriesContext(connection) as context:
+                title.delete()
+            queries.append(len(context.captured_queries))
+        assert queries[0] == queries[1], (
+            'Проверьте, что при удалении произведения число запросов '
+            'не растёт с числом отзывов и комментариев'
+        )
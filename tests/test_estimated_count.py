@@ -0,0 +1,96 @@
+import pytest
+
+from api import pagination
+from reviews.models import Comment, Review
+
+ESTIMATE = 50000
+
+
+@pytest.fixture
+def estimated(monkeypatch, settings):
+    """Планировщик оценивает выборку выше порога, как на большой таблице."""
+    settings.PAGINATION_ESTIMATE_THRESHOLD = 1000
+    monkeypatch.setattr(pagination, 'planner_estimate',
+                        lambda queryset: ESTIMATE)
+
+
+@pytest.mark.django_db
+class TestEstimatedCount:
+
+    def test_small_lists_are_counted_exactly(self, titles, anon_client):
+        data = anon_client.get('/api/v1/titles/').json()
+        assert data['count'] == len(titles)
+        assert data['count_exact'] is True, (
+            'Проверьте, что ответ сообщает о точном count'
+        )
+
+    def test_large_lists_use_planner_estimate(self, titles, estimated,
+                                              user_client,
+                                              django_assert_num_queries):
+        # Только страница произведений и связи с жанрами, без COUNT(*).
+        with django_assert_num_queries(5, exact=False) as context:
+            data = user_client.get('/api/v1/titles/').json()
+        assert not any('COUNT(' in query['sql']
+                       for query in context.captured_queries)
+        assert (data['count'], data['count_exact']) == (ESTIMATE, False), (
+            'Проверьте, что для большой выборки count берётся из оценки '
+            'планировщика'
+        )
+        assert data['next'].endswith('?page=2'), (
+            'Проверьте, что ссылка на следующую страницу строится по '
+            'лишней прочитанной строке'
+        )
+        assert len(data['results']) == 5
+
+    def test_estimated_pages_follow_real_rows(self, titles, estimated,
+                                              anon_client):
+        last = anon_client.get('/api/v1/titles/?page=2').json()
+        assert last['count_exact'] is False
+        assert [item['id'] for item in last['results']] == [titles[0].id]
+        assert last['next'] is None, (
+            'Проверьте, что на последней странице нет ссылки на следующую, '
+            'хотя оценка обещает больше строк'
+        )
+        assert anon_client.get('/api/v1/titles/?page=3').status_code == 404
+
+    def test_last_page_is_counted_exactly(self, titles, estimated,
+                                          anon_client):
+        response = anon_client.get('/api/v1/titles/?page=last')
+        assert response.status_code == 200, (
+            'Проверьте, что ?page=last работает при оценке числа строк'
+        )
+        data = response.json()
+        assert (data['count'], data['count_exact']) == (len(titles), True)
+        assert [item['id'] for item in data['results']] == [titles[0].id]
+        assert data['next'] is None
+
+    def test_review_count_comes_from_title(self, title, reviews, estimated,
+                                           anon_client):
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        data = anon_client.get(url).json()
+        assert (data['count'], data['count_exact']) == (len(reviews), True), (
+            'Проверьте, что число отзывов берётся из счётчика произведения'
+        )
+        Review.objects.filter(pk=reviews[0].pk).delete()
+        assert anon_client.get(url).json()['count'] == len(reviews) - 1
+
+    def test_drifted_counter_does_not_hide_rows(self, reviews, anon_client):
+        # bulk_create не вызывает сигналы, comments_count остаётся 0.
+        Comment.objects.bulk_create(
+            Comment(review=reviews[0], author=reviews[0].author, text='Текст')
+            for _ in range(7)
+        )
+        url = (f'/api/v1/titles/{reviews[0].title_id}/reviews/'
+               f'{reviews[0].id}/comments/')
+        first = anon_client.get(url).json()
+        assert len(first['results']) == 5, (
+            'Проверьте, что заниженный счётчик не обрезает страницу'
+        )
+        assert first['count_exact'] is False
+        assert first['count'] >= 6
+        assert first['next'].endswith('?page=2')
+        last = anon_client.get(first['next']).json()
+        assert (last['count'], last['count_exact']) == (7, True), (
+            'Проверьте, что последняя страница уточняет сохранённый счётчик'
+        )
+        assert len(last['results']) == 2
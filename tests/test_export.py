@@ -0,0 +1,68 @@
+import csv
+import io
+import json
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Comment
+
+
+def read_stream(response):
+    return b''.join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db
+class TestExport:
+
+    def test_reviews_ndjson(self, title, reviews, admin_client):
+        response = admin_client.get('/api/v1/export/reviews/')
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith('application/x-ndjson')
+        rows = [json.loads(line)
+                for line in read_stream(response).splitlines()]
+        assert [row['id'] for row in rows] == [
+            review.id for review in reviews
+        ], 'Проверьте, что выгружаются все отзывы в порядке id'
+        assert rows[0]['author'] == reviews[0].author.username
+        assert rows[0]['title_id'] == title.id
+
+    def test_comments_csv_with_filters(self, title, reviews, user,
+                                       admin_client):
+        Comment.objects.create(review=reviews[0], author=user, text='Да')
+        Comment.objects.create(review=reviews[1], author=reviews[1].author,
+                               text='Нет')
+        response = admin_client.get(
+            f'/api/v1/export/comments/?output=csv&title={title.id}'
+            f'&author={user.username}&since=2000-01-01'
+        )
+        assert response['Content-Type'].startswith('text/csv')
+        rows = list(csv.DictReader(io.StringIO(read_stream(response))))
+        assert [row['text'] for row in rows] == ['Да'], (
+            'Проверьте фильтры выгрузки по произведению и автору'
+        )
+        assert rows[0]['review_id'] == str(reviews[0].id)
+
+    def test_until_excludes_rows(self, reviews, admin_client):
+        response = admin_client.get(
+            '/api/v1/export/reviews/?until=2000-01-01'
+        )
+        assert read_stream(response) == ''
+
+    def test_bad_parameters(self, admin_client):
+        response = admin_client.get('/api/v1/export/reviews/?since=вчера')
+        assert response.status_code == 400
+        response = admin_client.get('/api/v1/export/reviews/?output=xml')
+        assert response.status_code == 400
+
+    def test_only_admin(self, user_client, anon_client):
+        assert user_client.get('/api/v1/export/reviews/').status_code == 403
+        assert anon_client.get('/api/v1/export/reviews/').status_code == 401
+
+    def test_command(self, reviews):
+        out = io.StringIO()
+        call_command('export_reviews', 'reviews', '--output=csv',
+                     '--chunk-size=1', stdout=out)
+        lines = out.getvalue().splitlines()
+        assert lines[0] == 'id,title_id,author,score,text,pub_date'
+        assert len(lines) == len(reviews) + 1
@@ -0,0 +1,52 @@
+import pytest
+
+from api.views import CommentViewSet, ReviewViewSet, TitleViewSet
+from reviews.models import Comment
+
+URLS = (
+    (TitleViewSet, '/api/v1/titles/'),
+    (TitleViewSet, '/api/v1/titles/?page=2'),
+    (TitleViewSet, '/api/v1/titles/?genre=drama'),
+    (TitleViewSet, '/api/v1/titles/?search=произведение'),
+    (TitleViewSet, '/api/v1/titles/?omit=genre'),
+    (ReviewViewSet, '/api/v1/titles/{title}/reviews/'),
+    (ReviewViewSet, '/api/v1/titles/{title}/reviews/?cursor='),
+    (ReviewViewSet, '/api/v1/titles/{title}/reviews/?fields=author,score'),
+    (CommentViewSet, '/api/v1/titles/{title}/reviews/{review}/comments/'),
+)
+
+
+@pytest.fixture
+def comments(reviews, user):
+    return [
+        Comment.objects.create(review=reviews[0], author=user,
+                               text=f'Комментарий {index}')
+        for index in range(7)
+    ]
+
+
+@pytest.mark.django_db
+class TestFastList:
+
+    @pytest.mark.parametrize('viewset,url', URLS)
+    def test_same_bytes_as_serializer(self, viewset, url, title, titles,
+                                      reviews, comments, user_client,
+                                      monkeypatch):
+        titles[1].category = None
+        titles[1].save()
+        url = url.format(title=title.id, review=reviews[0].id)
+        fast = user_client.get(url)
+        monkeypatch.setattr(viewset, 'fast_list', False)
+        regular = user_client.get(url)
+        assert fast.status_code == 200
+        assert fast.content == regular.content, (
+            'Проверьте, что быстрый путь отдаёт тот же JSON, что и сериализатор'
+        )
+
+    def test_titles_list_reads_no_instances(self, titles, warm_lookups,
+                                            user_client,
+                                            django_assert_num_queries):
+        # COUNT, страница произведений и связи с жанрами страницы.
+        with django_assert_num_queries(3):
+            response = user_client.get('/api/v1/titles/')
+        assert response.json()['results'][0]['genre']
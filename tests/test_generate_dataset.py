@@ -0,0 +1,67 @@
+import datetime
+import io
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db.models import Count
+from django.utils import timezone
+
+from reviews.generator import DatasetGenerator
+from reviews.models import Comment, Review, Title
+from users.models import CustomUser
+
+
+@pytest.mark.django_db
+class TestGenerateDataset:
+
+    def test_command_fills_database(self):
+        cache.set('unrelated', 'value')
+        out = io.StringIO()
+        call_command('generate_dataset', '--users=50', '--titles=40',
+                     '--reviews=400', '--comments=100', '--batch-size=64',
+                     stdout=out)
+        assert CustomUser.objects.count() == 50
+        assert Title.objects.count() == 40
+        assert Comment.objects.count() == 100
+        reviews = Review.objects.count()
+        assert 300 < reviews <= 450, (
+            'Проверьте, что число отзывов близко к заданному'
+        )
+        per_title = sorted(
+            Title.objects.annotate(total=Count('review_title'))
+            .values_list('total', flat=True),
+            reverse=True
+        )
+        assert per_title[0] == 50 and per_title[0] > 10 * per_title[-1], (
+            'Проверьте перекос популярности произведений'
+        )
+        assert set(CustomUser.objects.values_list('role', flat=True)) <= {
+            'user', 'moderator', 'admin'
+        }
+        assert Title.genre.through.objects.count() >= 40
+        assert Title.objects.exclude(reviews_count=0).filter(
+            rating__isnull=True
+        ).count() == 0, 'Проверьте, что рейтинги пересчитаны'
+        assert 'reviews:' in out.getvalue()
+        assert cache.get('unrelated') == 'value', (
+            'Проверьте, что генерация не очищает весь кеш'
+        )
+
+    def test_rows_are_reproducible(self):
+        first = DatasetGenerator(20, 10, 50, 20, seed=7)
+        second = DatasetGenerator(20, 10, 50, 20, seed=7)
+        for kind in ('users', 'titles', 'reviews', 'comments'):
+            assert list(first.rows(kind)) == list(second.rows(kind))
+        other = DatasetGenerator(20, 10, 50, 20, seed=8)
+        assert list(other.rows('titles')) != list(first.rows('titles'))
+
+    def test_dates_end_at_until(self):
+        until = timezone.make_aware(datetime.datetime(2024, 6, 1))
+        dates = [row['pub_date'] for row in DatasetGenerator(
+            20, 10, 50, 20, until=until
+        ).rows('reviews')]
+        assert dates and max(dates) <= until, (
+            'Проверьте, что даты публикации отсчитываются от until, '
+            'а не от текущего времени'
+        )
@@ -0,0 +1,111 @@
+import io
+import json
+
+import pytest
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError
+
+from api.cache import get_versions, version_key
+from reviews.models import Comment, Review, Title
+from reviews.search import search_titles
+
+
+def write(path, text):
+    path.write_text(text, encoding='utf-8')
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    write(tmp_path / 'categories.csv', 'name,slug\nКино,movie\nКниги,book\n')
+    write(tmp_path / 'genres.jsonl', '\n'.join(json.dumps(row) for row in (
+        {'name': 'Драма', 'slug': 'drama'},
+        {'name': 'Комедия', 'slug': 'comedy'},
+    )))
+    write(tmp_path / 'users.csv',
+          'username,email,role\n'
+          'reader,reader@yamdb.fake,user\n'
+          'critic,critic@yamdb.fake,moderator\n')
+    write(tmp_path / 'titles.csv',
+          'id,name,year,category,genre,description\n'
+          '100,Крёстный отец,1972,movie,drama,\n'
+          '101,Двенадцать стульев,1928,book,comedy|drama,Роман\n')
+    write(tmp_path / 'reviews.csv',
+          'id,title_id,author,score,text,pub_date\n'
+          '1,100,reader,10,Шедевр,2020-05-01T12:00:00+00:00\n'
+          '2,100,critic,7,Неплохо,2020-05-02\n'
+          '3,101,critic,9,Смешно,\n')
+    write(tmp_path / 'comments.jsonl', json.dumps(
+        {'review_id': 1, 'author': 'critic', 'text': 'Согласен'}
+    ))
+    return tmp_path
+
+
+@pytest.mark.django_db
+class TestImport:
+
+    def test_import_directory(self, data_dir):
+        out = io.StringIO()
+        call_command('import_yamdb', str(data_dir), '--batch-size=2',
+                     stdout=out)
+        assert 'reviews: 3 строк' in out.getvalue(), (
+            'Проверьте, что команда сообщает число строк по видам'
+        )
+        title = Title.objects.get(pk=101)
+        assert title.category.slug == 'book'
+        assert set(title.genre.values_list('slug', flat=True)) == {
+            'comedy', 'drama'
+        }
+        assert Title.objects.get(pk=100).rating == 8.5, (
+            'Проверьте, что рейтинг пересчитывается после загрузки'
+        )
+        assert Review.objects.get(pk=1).pub_date.year == 2020, (
+            'Проверьте, что pub_date берётся из файла'
+        )
+        assert Comment.objects.get().review_id == 1
+        found = search_titles(Title.objects.all(), 'стульев')
+        assert [item.id for item in found] == [101]
+
+    def test_ids_continue_after_import(self, data_dir, user):
+        call_command('import_yamdb', str(data_dir), stdout=io.StringIO())
+        review = Review.objects.create(title_id=101, author=user,
+                                       text='Новый', score=5)
+        assert review.id > 3
+
+    def test_single_file_and_conflicts(self, data_dir):
+        path = str(data_dir / 'categories.csv')
+        call_command('import_yamdb', path, '--kind=categories',
+                     stdout=io.StringIO())
+        with pytest.raises(IntegrityError):
+            call_command('import_yamdb', path, '--kind=categories',
+                         stdout=io.StringIO())
+        call_command('import_yamdb', path, '--kind=categories',
+                     '--ignore-conflicts', stdout=io.StringIO())
+
+    def test_unknown_slug(self, data_dir):
+        (data_dir / 'categories.csv').unlink()
+        with pytest.raises(CommandError, match='movie'):
+            call_command('import_yamdb', str(data_dir),
+                         stdout=io.StringIO())
+
+    def test_broken_json_line(self, data_dir):
+        with (data_dir / 'comments.jsonl').open('a', encoding='utf-8') as file:
+            file.write('\n{"review_id": 1,\n')
+        with pytest.raises(CommandError, match='comments.jsonl: строка 2'):
+            call_command('import_yamdb', str(data_dir),
+                         stdout=io.StringIO())
+
+    def test_import_invalidates_only_api_versions(self, data_dir):
+        cache.set('unrelated', 'value')
+        keys = [version_key(Title), version_key(Title, 100),
+                version_key(Review, 1)]
+        before = get_versions(keys)
+        call_command('import_yamdb', str(data_dir), stdout=io.StringIO())
+        assert cache.get('unrelated') == 'value', (
+            'Проверьте, что загрузка не очищает весь кеш'
+        )
+        after = get_versions(keys)
+        assert all(old != new for old, new in zip(before, after)), (
+            'Проверьте, что загрузка сдвигает версии моделей и изменённых '
+            'записей'
+        )
@@ -0,0 +1,91 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.lookups import LocalTableCache
+from reviews.models import Categories, Genre, Title
+
+LOOKUP_TABLES = ('"reviews_genre"', '"reviews_categories"')
+
+
+def lookup_queries(queries):
+    """Запросы, читающие строки справочников."""
+    return [
+        query['sql'] for query in queries
+        if any(f'{table}."name"' in query['sql'] for table in LOOKUP_TABLES)
+    ]
+
+
+def slug_queries(queries):
+    """Запросы, ищущие запись справочника по slug."""
+    return [
+        query['sql'] for query in queries
+        if any(f'{table}."slug" =' in query['sql']
+               for table in LOOKUP_TABLES)
+    ]
+
+
+@pytest.mark.django_db
+class TestLocalLookups:
+
+    def test_snapshot_is_reused_until_version_changes(
+            self, genres, django_assert_num_queries):
+        table = LocalTableCache(Genre)
+        with django_assert_num_queries(1):
+            table.get()
+        with django_assert_num_queries(0):
+            assert table.get().by_slug['drama'].name == 'Драма'
+        # Запись в другом воркере видна по версии в общем кеше.
+        Genre.objects.create(name='Вестерн', slug='western')
+        assert 'western' in table.get().by_slug, (
+            'Проверьте, что копия справочника перечитывается после '
+            'изменения таблицы'
+        )
+
+    def test_title_create_resolves_slugs_without_queries(
+            self, warm_lookups, admin_client):
+        with CaptureQueriesContext(connection) as queries:
+            response = admin_client.post('/api/v1/titles/', data={
+                'name': 'Новое', 'year': 2000, 'category': 'book',
+                'genre': ['drama', 'sci-fi'],
+            })
+        assert response.status_code == 201
+        assert not slug_queries(queries), (
+            'Проверьте, что slug жанров и категории разрешаются по копии '
+            'справочника в памяти'
+        )
+        title = Title.objects.get(pk=response.json()['id'])
+        assert title.category.slug == 'book'
+        assert {genre.slug for genre in title.genre.all()} == {
+            'drama', 'sci-fi'
+        }
+
+    def test_unknown_slug_is_rejected(self, warm_lookups, admin_client):
+        response = admin_client.post('/api/v1/titles/', data={
+            'name': 'Новое', 'year': 2000, 'category': 'missing',
+            'genre': ['drama'],
+        })
+        assert response.status_code == 400
+        assert response.json()['category'] == [
+            'Объект с slug=missing не существует.'
+        ]
+
+    def test_title_list_reads_no_lookup_tables(self, warm_lookups,
+                                               anon_client):
+        with CaptureQueriesContext(connection) as queries:
+            response = anon_client.get('/api/v1/titles/')
+        assert response.status_code == 200
+        assert not lookup_queries(queries), (
+            'Проверьте, что список произведений берёт жанры и категории '
+            'из копии справочника'
+        )
+
+    def test_title_list_follows_lookup_changes(self, warm_lookups, titles,
+                                               anon_client):
+        Categories.objects.filter(slug='book').update(name='Роман')
+        Categories.objects.get(slug='book').save()
+        response = anon_client.get('/api/v1/titles/?category=book')
+        assert {item['category']['name']
+                for item in response.json()['results']} == {'Роман'}, (
+            'Проверьте, что изменённая категория сразу видна в списке'
+        )
@@ -0,0 +1,55 @@
+import pytest
+
+from api.metrics import registry
+
+
+@pytest.mark.django_db
+class TestRequestMetrics:
+
+    def test_server_timing_header(self, title, reviews, user_client,
+                                  settings):
+        settings.SERVER_TIMING_HEADER = True
+        response = user_client.get(f'/api/v1/titles/{title.id}/reviews/')
+        header = response['Server-Timing']
+        for phase in ('total', 'db', 'auth', 'permissions', 'throttle',
+                      'serializer', 'view'):
+            assert f'{phase};dur=' in header, (
+                f'Проверьте, что Server-Timing содержит фазу {phase}'
+            )
+        assert 'queries"' in header
+
+    def test_header_is_off_by_default(self, title, anon_client, settings):
+        settings.SERVER_TIMING_HEADER = False
+        response = anon_client.get(f'/api/v1/titles/{title.id}/')
+        assert 'Server-Timing' not in response
+
+    def test_metrics_endpoint(self, title, reviews, anon_client,
+                              admin_client, user_client):
+        registry.clear()
+        anon_client.get(f'/api/v1/titles/{title.id}/reviews/')
+        anon_client.get('/api/v1/titles/')
+
+        assert anon_client.get('/metrics').status_code == 401
+        assert user_client.get('/metrics').status_code == 403, (
+            'Проверьте, что метрики доступны только администратору'
+        )
+        response = admin_client.get('/metrics')
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith('text/plain')
+        body = response.content.decode()
+        assert ('yamdb_request_phase_seconds_count'
+                '{endpoint="reviews-list",phase="db"} 1') in body
+        assert 'yamdb_request_db_queries_bucket{endpoint="title-list",' in body
+        for endpoint in ('reviews-list', 'title-list'):
+            assert ('yamdb_request_phase_seconds_count'
+                    f'{{endpoint="{endpoint}",phase="serializer"}} 1'
+                    ) in body, (
+                'Проверьте, что время сериализации замеряется отдельной фазой'
+            )
+
+    def test_serializer_phase_on_writes(self, title, user_client, settings):
+        settings.SERVER_TIMING_HEADER = True
+        response = user_client.post(f'/api/v1/titles/{title.id}/reviews/',
+                                    data={'text': 'Отзыв', 'score': 5})
+        assert response.status_code == 201
+        assert 'serializer;dur=' in response['Server-Timing']
@@ -0,0 +1,88 @@
+import smtplib
+from unittest import mock
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+
+from users.models import OutgoingEmail
+
+
+@pytest.mark.django_db
+class TestEmailOutbox:
+
+    def test_sign_up_only_queues_email(self, anon_client):
+        response = anon_client.post('/api/v1/auth/signup/', data={
+            'username': 'newcomer', 'email': 'newcomer@yamdb.fake'
+        })
+        assert response.status_code == 200
+        assert len(mail.outbox) == 0, (
+            'Проверьте, что регистрация не отправляет письмо в запросе'
+        )
+        email = OutgoingEmail.objects.get()
+        assert email.recipient == 'newcomer@yamdb.fake'
+        assert email.sent_at is None
+
+    def test_worker_sends_batch_over_one_connection(self, anon_client):
+        for index in range(3):
+            anon_client.post('/api/v1/auth/signup/', data={
+                'username': f'newcomer{index}',
+                'email': f'newcomer{index}@yamdb.fake'
+            })
+        with mock.patch(
+            'django.core.mail.backends.locmem.EmailBackend.open'
+        ) as opened:
+            call_command('send_emails', batch_size=10)
+        assert opened.call_count == 1, (
+            'Проверьте, что пачка писем отправляется через одно соединение'
+        )
+        assert len(mail.outbox) == 3
+        assert 'Код подтверждения' in mail.outbox[0].body
+        assert not OutgoingEmail.objects.filter(sent_at__isnull=True)
+
+    def test_failed_email_is_retried_with_backoff(self):
+        email = OutgoingEmail.objects.create(
+            subject='Тема', message='Текст', from_email='admin@yamdb.com',
+            recipient='user@yamdb.fake'
+        )
+        with mock.patch(
+            'django.core.mail.backends.locmem.EmailBackend.send_messages',
+            side_effect=smtplib.SMTPServerDisconnected('timeout')
+        ):
+            call_command('send_emails')
+        email.refresh_from_db()
+        assert email.attempts == 1 and email.sent_at is None
+        assert email.next_attempt_at > email.created, (
+            'Проверьте, что неудачная отправка откладывается'
+        )
+        assert 'timeout' in email.last_error
+
+        call_command('send_emails')
+        assert len(mail.outbox) == 0, (
+            'Проверьте, что письмо не отправляется раньше срока повтора'
+        )
+        OutgoingEmail.objects.update(next_attempt_at=email.created)
+        call_command('send_emails')
+        email.refresh_from_db()
+        assert email.sent_at is not None and email.attempts == 2
+        assert len(mail.outbox) == 1
+
+    def test_unreachable_server_backs_off_whole_batch(self):
+        for index in range(2):
+            OutgoingEmail.objects.create(
+                subject='Тема', message='Текст',
+                from_email='admin@yamdb.com',
+                recipient=f'user{index}@yamdb.fake'
+            )
+        with mock.patch(
+            'django.core.mail.backends.locmem.EmailBackend.open',
+            side_effect=ConnectionRefusedError('refused')
+        ):
+            call_command('send_emails')
+        for email in OutgoingEmail.objects.all():
+            assert email.attempts == 1 and email.sent_at is None, (
+                'Проверьте, что недоступный SMTP-сервер засчитывает попытку, '
+                'а не роняет обработчик'
+            )
+            assert email.next_attempt_at > email.created
+            assert 'refused' in email.last_error
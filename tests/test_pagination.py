@@ -0,0 +1,89 @@
+import pytest
+
+from reviews.models import Comment, Review, Title
+
+
+@pytest.fixture
+def many_reviews(title, django_user_model):
+    django_user_model.objects.bulk_create(
+        django_user_model(username=f'reader{index}',
+                          email=f'reader{index}@yamdb.fake')
+        for index in range(23)
+    )
+    authors = django_user_model.objects.filter(
+        username__startswith='reader'
+    ).order_by('id')
+    Review.objects.bulk_create(
+        Review(title=title, author=author, text=f'Отзыв {index}', score=5)
+        for index, author in enumerate(authors)
+    )
+    # bulk_create обходит сигналы, счётчики пересчитываются как после
+    # импорта.
+    Title.objects.recalculate_rating()
+    return list(Review.objects.filter(title=title))
+
+
+@pytest.mark.django_db
+class TestReviewPagination:
+
+    def test_page_number_clients_keep_working(self, title, many_reviews,
+                                              anon_client):
+        response = anon_client.get(
+            f'/api/v1/titles/{title.id}/reviews/?page=2'
+        )
+        data = response.json()
+        assert data['count'] == len(many_reviews), (
+            'Проверьте, что пагинация по номеру страницы возвращает count'
+        )
+        assert [item['text'] for item in data['results']] == [
+            f'Отзыв {index}' for index in range(5, 10)
+        ]
+
+    def test_cursor_pages_walk_all_reviews(self, title, many_reviews,
+                                           anon_client):
+        url = f'/api/v1/titles/{title.id}/reviews/?cursor='
+        seen = []
+        while url:
+            data = anon_client.get(url).json()
+            assert 'count' not in data, (
+                'Проверьте, что курсорная пагинация не считает COUNT(*)'
+            )
+            seen.extend(item['id'] for item in data['results'])
+            url = data['next']
+        assert seen == sorted(review.id for review in many_reviews)
+
+    def test_deep_cursor_page_costs_as_first(self, title, many_reviews,
+                                             anon_client,
+                                             django_assert_num_queries):
+        url = f'/api/v1/titles/{title.id}/reviews/?cursor='
+        pages = []
+        while url:
+            pages.append(url)
+            url = anon_client.get(url).json()['next']
+        captured = []
+        for page in (pages[0], pages[-1]):
+            with django_assert_num_queries(100, exact=False) as context:
+                anon_client.get(page)
+            captured.append(context.captured_queries)
+            assert not any(
+                'COUNT(' in query['sql'] or 'OFFSET' in query['sql']
+                for query in context.captured_queries
+            ), 'Проверьте, что курсорная страница не использует COUNT/OFFSET'
+        assert len(pages) > 2
+        assert len(captured[0]) == len(captured[-1]), (
+            'Проверьте, что глубокая страница стоит столько же запросов, '
+            'сколько первая'
+        )
+
+    def test_comment_cursor(self, title, reviews, user, anon_client):
+        review = reviews[0]
+        Comment.objects.bulk_create(
+            Comment(review=review, author=user, text=f'Комментарий {index}')
+            for index in range(7)
+        )
+        url = (f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/'
+               '?cursor=')
+        first = anon_client.get(url).json()
+        second = anon_client.get(first['next']).json()
+        assert len(first['results']) + len(second['results']) == 7
+        assert second['next'] is None
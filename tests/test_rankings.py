@@ -0,0 +1,135 @@
+import datetime
+import math
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from reviews.models import Review, Title
+from reviews.ranking import sum_trending, trending_exponent
+
+
+@pytest.fixture
+def ranked(titles, admin, moderator, user):
+    """
+    titles[0]: оценки 10, 7, 4; titles[1]: одна оценка 8;
+    titles[2]: оценки 9 и 9, но отзывы месячной давности.
+    """
+    scores = {
+        titles[0]: ((admin, 10), (moderator, 7), (user, 4)),
+        titles[1]: ((admin, 8),),
+        titles[2]: ((admin, 9), (user, 9)),
+    }
+    for title, marks in scores.items():
+        for author, score in marks:
+            Review.objects.create(title=title, author=author, text='Отзыв',
+                                  score=score)
+    Review.objects.filter(title=titles[2]).update(
+        pub_date=timezone.now() - datetime.timedelta(days=30)
+    )
+    Title.objects.filter(pk=titles[2].pk).recalculate_trending()
+    return titles
+
+
+def ids(response):
+    return [item['id'] for item in response.json()['results']]
+
+
+@pytest.mark.django_db
+class TestRankings:
+
+    def test_top_orders_by_bayesian_rating(self, ranked, anon_client,
+                                           settings):
+        settings.RATING_PRIOR_MEAN = 5
+        settings.RATING_PRIOR_WEIGHT = 2
+        call_command('recalculate_ratings')
+        response = anon_client.get('/api/v1/titles/top/')
+        assert response.status_code == 200
+        # (5 * 2 + 18) / 4 = 7, (5 * 2 + 21) / 5 = 6.2, (5 * 2 + 8) / 3 = 6.
+        assert ids(response) == [ranked[2].id, ranked[0].id, ranked[1].id], (
+            'Проверьте, что /titles/top/ упорядочен по байесовскому '
+            'рейтингу и не включает произведения без отзывов'
+        )
+        ranked[2].refresh_from_db()
+        assert ranked[2].bayesian_rating == pytest.approx(7)
+
+    def test_bayesian_rating_follows_review_writes(self, title, user, admin,
+                                                   settings):
+        settings.RATING_PRIOR_MEAN = 5
+        settings.RATING_PRIOR_WEIGHT = 2
+        review = Review.objects.create(title=title, author=user,
+                                       text='Отзыв', score=8)
+        title.refresh_from_db()
+        assert title.bayesian_rating == pytest.approx(6), (
+            'Проверьте, что байесовский рейтинг обновляется при создании '
+            'отзыва'
+        )
+        review.delete()
+        title.refresh_from_db()
+        assert title.bayesian_rating is None
+        assert title.trending_score is None, (
+            'Проверьте, что у произведения без отзывов нет популярности'
+        )
+
+    def test_trending_prefers_recent_reviews(self, ranked, anon_client):
+        response = anon_client.get('/api/v1/titles/trending/')
+        assert response.status_code == 200
+        assert ids(response) == [ranked[0].id, ranked[1].id, ranked[2].id], (
+            'Проверьте, что /titles/trending/ упорядочен по популярности '
+            'с затуханием по дате отзыва'
+        )
+
+    def test_incremental_trending_matches_rebuild(self, ranked):
+        Review.objects.filter(title=ranked[0]).first().delete()
+        stored = dict(Title.objects.values_list('id', 'trending_score'))
+        Title.objects.update(trending_score=None)
+        call_command('recalculate_ratings')
+        rebuilt = dict(Title.objects.values_list('id', 'trending_score'))
+        assert rebuilt == pytest.approx(stored), (
+            'Проверьте, что команда recalculate_ratings восстанавливает '
+            'ту же популярность, что поддерживают сигналы'
+        )
+        expected = sum_trending(
+            Review.objects.values_list('title_id', 'pub_date')
+        )
+        assert rebuilt[ranked[0].id] == pytest.approx(expected[ranked[0].id])
+
+    def test_half_life(self):
+        now = timezone.now()
+        week_ago = now - datetime.timedelta(days=7)
+        assert trending_exponent(now) - trending_exponent(week_ago) == (
+            pytest.approx(math.log(2))
+        )
+
+    def test_trending_survives_distant_dates(self, title, admin, user):
+        # Через 100 лет при полураспаде в сутки вклад отзыва - 2 ** 36500.
+        pub_date = timezone.now() + datetime.timedelta(days=36500)
+        with mock.patch('reviews.ranking.TRENDING_HALF_LIFE',
+                        datetime.timedelta(days=1)), \
+                mock.patch('django.utils.timezone.now',
+                           return_value=pub_date):
+            for author in (admin, user):
+                Review.objects.create(title=title, author=author,
+                                      text='Отзыв', score=5)
+            title.refresh_from_db()
+            assert title.trending_score == pytest.approx(
+                trending_exponent(pub_date) + math.log(2)
+            ), 'Проверьте, что популярность не переполняется со временем'
+            Review.objects.get(author=admin).delete()
+            title.refresh_from_db()
+            assert title.trending_score == pytest.approx(
+                trending_exponent(pub_date)
+            )
+
+    @pytest.mark.parametrize('ranking', ('top', 'trending'))
+    def test_rankings_accept_title_filters(self, ranked, anon_client,
+                                           ranking):
+        genre = anon_client.get(f'/api/v1/titles/{ranking}/?genre=comedy')
+        assert set(ids(genre)) == {ranked[1].id, ranked[2].id}, (
+            'Проверьте, что подборка фильтруется по жанру'
+        )
+        category = anon_client.get(f'/api/v1/titles/{ranking}/?category=book')
+        assert ids(category) == [ranked[1].id], (
+            'Проверьте, что подборка фильтруется по категории'
+        )
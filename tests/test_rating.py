@@ -0,0 +1,91 @@
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.views import ReviewViewSet
+from reviews.models import Review, Title
+
+
+@pytest.mark.django_db
+class TestStoredRating:
+
+    def test_rating_follows_review_writes(self, title, user_client, user,
+                                          admin):
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        response = user_client.post(url, data={'text': 'Отзыв', 'score': 8})
+        assert response.status_code == 201, (
+            'Проверьте, что отзыв к произведению создаётся'
+        )
+        Review.objects.create(title=title, author=admin, text='Ещё',
+                              score=3)
+        title.refresh_from_db()
+        assert (title.rating_sum, title.reviews_count) == (11, 2), (
+            'Проверьте, что сумма и количество оценок обновляются '
+            'при создании отзыва'
+        )
+        assert title.rating == pytest.approx(5.5)
+
+        review_id = response.json()['id']
+        user_client.patch(f'{url}{review_id}/', data={'score': 1})
+        title.refresh_from_db()
+        assert title.rating == pytest.approx(2), (
+            'Проверьте, что рейтинг пересчитывается при изменении отзыва'
+        )
+
+        user_client.delete(f'{url}{review_id}/')
+        Review.objects.filter(author=admin).delete()
+        title.refresh_from_db()
+        assert (title.rating_sum, title.reviews_count) == (0, 0)
+        assert title.rating is None, (
+            'Проверьте, что у произведения без отзывов нет рейтинга'
+        )
+
+    def test_recalculate_ratings_command(self, title, reviews):
+        Title.objects.update(rating_sum=0, reviews_count=0, rating=None)
+        call_command('recalculate_ratings')
+        title.refresh_from_db()
+        assert (title.rating_sum, title.reviews_count) == (21, 3)
+        assert title.rating == pytest.approx(7), (
+            'Проверьте, что команда recalculate_ratings пересчитывает '
+            'рейтинг по отзывам'
+        )
+
+    def test_title_response_has_stored_rating(self, title, reviews,
+                                              anon_client):
+        response = anon_client.get(f'/api/v1/titles/{title.id}/')
+        assert response.json()['rating'] == pytest.approx(7)
+
+    def test_review_edit_shifts_rating_without_aggregates(
+            self, title, reviews, admin_client):
+        url = f'/api/v1/titles/{title.id}/reviews/{reviews[0].id}/'
+        with CaptureQueriesContext(connection) as queries:
+            response = admin_client.patch(url, data={'score': 1})
+        assert response.status_code == 200
+        assert not [query for query in queries
+                    if 'SUM(' in query['sql'] or 'AVG(' in query['sql']], (
+            'Проверьте, что изменение оценки сдвигает рейтинг на разницу, '
+            'а не пересчитывает его по всем отзывам'
+        )
+        title.refresh_from_db()
+        assert (title.rating_sum, title.reviews_count) == (12, 3)
+        assert title.rating == pytest.approx(4)
+
+    def test_review_edit_locks_the_row(self, title, reviews, admin_client):
+        get_object = ReviewViewSet.get_object
+        locked = []
+
+        def spy(view):
+            locked.append(view.get_queryset().query.select_for_update)
+            return get_object(view)
+
+        url = f'/api/v1/titles/{title.id}/reviews/{reviews[0].id}/'
+        with mock.patch.object(ReviewViewSet, 'get_object', spy):
+            admin_client.patch(url, data={'score': 1})
+            admin_client.get(url)
+        assert locked == [True, False], (
+            'Проверьте, что изменяемый отзыв читается с блокировкой строки, '
+            'чтобы параллельные изменения не сдвинули рейтинг дважды'
+        )
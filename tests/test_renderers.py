@@ -0,0 +1,73 @@
+import datetime
+import decimal
+import io
+import os
+
+import pytest
+from django.conf import settings
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+
+from api import renderers
+from api.renderers import FastJSONParser, FastJSONRenderer
+
+DATA = {
+    'results': [
+        {'id': 1, 'name': 'Сталкер', 'rating': 8.25, 'category': None,
+         'genre': [{'name': 'Драма', 'slug': 'drama'}]},
+        {'id': 2, 'name': 'Строка\u2028перенос', 'rating': 1 / 3,
+         'pub_date': datetime.datetime(2022, 1, 2, 3, 4, 5),
+         'price': decimal.Decimal('1.50'), 'detail': gettext_lazy('Ошибка')},
+    ],
+    'count': 2,
+    'next': None,
+}
+
+
+class TestFastJSON:
+
+    @pytest.mark.parametrize('use_orjson', (True, False))
+    def test_same_bytes_as_drf_renderer(self, use_orjson, monkeypatch):
+        if not use_orjson:
+            monkeypatch.setattr(renderers, 'orjson', None)
+        assert FastJSONRenderer().render(DATA) == JSONRenderer().render(
+            DATA
+        ), 'Проверьте, что вывод совпадает со стандартным JSONRenderer'
+
+    def test_indent_falls_back(self):
+        rendered = FastJSONRenderer().render(
+            {'a': 1}, 'application/json; indent=2'
+        )
+        assert rendered == b'{\n  "a": 1\n}'
+
+    def test_parser(self):
+        parsed = FastJSONParser().parse(
+            io.BytesIO('{"text": "Отзыв", "score": 5}'.encode())
+        )
+        assert parsed == {'text': 'Отзыв', 'score': 5}
+
+    def test_nginx_compresses_json(self):
+        path = os.path.join(os.path.dirname(settings.BASE_DIR),
+                            'infra', 'nginx', 'default.conf')
+        with open(path) as conf:
+            config = conf.read()
+        assert 'gzip_proxied any' in config, (
+            'Проверьте, что nginx сжимает проксируемые ответы'
+        )
+        assert 'application/json' in config
+        assert 'gzip_min_length' in config
+
+
+@pytest.mark.django_db
+class TestJSONRequests:
+
+    def test_json_body_and_errors(self, title, user_client):
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        response = user_client.post(url, data={'text': 'Отзыв', 'score': 7},
+                                    format='json')
+        assert response.status_code == 201
+        assert response['Content-Type'] == 'application/json'
+        response = user_client.post(url, data='{"text": ',
+                                    content_type='application/json')
+        assert response.status_code == 400
+        assert 'JSON parse error' in response.json()['detail']
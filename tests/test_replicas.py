@@ -0,0 +1,121 @@
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+from api import replicas
+from reviews.models import Categories, Review, Title
+
+REPLICA = 'replica'
+
+
+@pytest.fixture(scope='module')
+def replica_db(tmp_path_factory, django_db_setup, django_db_blocker):
+    """
+    Реплика - отдельный файл SQLite со схемой основной базы. Данные
+    в неё копируют фикстуры, а отзывы, созданные в тесте, на реплику
+    не попадают, как при отставании репликации.
+    """
+    path = tmp_path_factory.mktemp('replica') / 'replica.sqlite3'
+    connections.databases[REPLICA] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': str(path),
+    }
+    with django_db_blocker.unblock():
+        call_command('migrate', database=REPLICA, verbosity=0)
+    yield REPLICA
+    connections[REPLICA].close()
+    del connections[REPLICA]
+    del connections.databases[REPLICA]
+
+
+@pytest.fixture
+def replica(replica_db, titles, settings):
+    Categories.objects.using(replica_db).bulk_create(Categories.objects.all())
+    Title.objects.using(replica_db).bulk_create(Title.objects.all())
+    settings.DATABASE_REPLICAS = [replica_db]
+    settings.REPLICA_STICKINESS_SECONDS = 60
+    replicas._unavailable.clear()
+    # Время изменения данных фикстур неизвестно, как после сброса кеша.
+    cache.clear()
+    yield replica_db
+    replicas._unavailable.clear()
+
+
+def count(response):
+    assert response.status_code == 200
+    return response.json()['count']
+
+
+def replica_queries(client, url):
+    with CaptureQueriesContext(connections[REPLICA]) as queries:
+        assert client.get(url).status_code == 200
+    return len(queries)
+
+
+@pytest.mark.django_db(databases=['default', REPLICA])
+class TestReplicaReads:
+
+    def test_safe_requests_read_replica(self, replica, title, user_client):
+        assert replica_queries(user_client, '/api/v1/titles/'), (
+            'Проверьте, что список произведений читается с реплики'
+        )
+        assert replica_queries(user_client, f'/api/v1/titles/{title.id}/')
+        assert replica_queries(user_client, '/api/v1/genres/')
+
+    def test_writes_go_to_primary(self, replica, title, user_client):
+        response = user_client.post(f'/api/v1/titles/{title.id}/reviews/',
+                                    data={'text': 'Отзыв', 'score': 6})
+        assert response.status_code == 201
+        assert Review.objects.using('default').count() == 1
+        assert Review.objects.using(REPLICA).count() == 0
+
+    def test_author_reads_own_writes(self, replica, title, user_client,
+                                     moderator_client, settings):
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        user_client.post(url, data={'text': 'Отзыв', 'score': 6})
+        assert count(user_client.get(url)) == 1, (
+            'Проверьте, что автор после записи читает с основной базы'
+        )
+        assert count(moderator_client.get(url)) == 1, (
+            'Проверьте, что недавно изменённые данные читаются с основной '
+            'базы и другими пользователями'
+        )
+
+    def test_replica_after_stickiness_window(self, replica, title,
+                                             user_client, settings):
+        settings.REPLICA_STICKINESS_SECONDS = 0
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        user_client.post(url, data={'text': 'Отзыв', 'score': 6})
+        assert count(user_client.get(url)) == 0, (
+            'Проверьте, что по истечении окна чтение возвращается на реплику'
+        )
+
+    def test_unavailable_replica_falls_back_to_primary(
+            self, replica, title, admin, user_client, settings,
+            tmp_path):
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        Review.objects.create(title=title, author=admin, text='Отзыв',
+                              score=5)
+        cache.clear()
+        settings.DATABASE_REPLICAS = ['broken']
+        connections.databases['broken'] = {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': str(tmp_path / 'missing' / 'replica.sqlite3'),
+        }
+        try:
+            assert count(user_client.get(url)) == 1, (
+                'Проверьте, что при недоступной реплике чтение идёт '
+                'с основной базы'
+            )
+            assert 'broken' in replicas._unavailable
+        finally:
+            connections['broken'].close()
+            del connections['broken']
+            del connections.databases['broken']
+
+    def test_without_replicas_reads_primary(self, replica, user_client,
+                                            settings):
+        settings.DATABASE_REPLICAS = []
+        assert not replica_queries(user_client, '/api/v1/titles/')
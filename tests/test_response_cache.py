@@ -0,0 +1,87 @@
+import pytest
+
+from reviews.models import Categories, Genre, Review
+
+
+@pytest.mark.django_db(transaction=True)
+class TestResponseCache:
+
+    def test_repeated_anonymous_list_hits_cache(self, titles, anon_client,
+                                                django_assert_num_queries):
+        first = anon_client.get('/api/v1/titles/?genre=drama&page=1')
+        with django_assert_num_queries(0):
+            second = anon_client.get('/api/v1/titles/?page=1&genre=drama')
+        assert first.json() == second.json(), (
+            'Проверьте, что повторный анонимный запрос отдаётся из кеша'
+        )
+
+    def test_query_params_are_part_of_key(self, titles, anon_client):
+        drama = anon_client.get('/api/v1/titles/?genre=drama').json()
+        comedy = anon_client.get('/api/v1/titles/?genre=comedy').json()
+        assert drama['count'] != comedy['count']
+
+    def test_review_invalidates_title_responses(self, title, user,
+                                                anon_client):
+        list_url = f'/api/v1/titles/?year={title.year}'
+        anon_client.get(list_url)
+        anon_client.get(f'/api/v1/titles/{title.id}/')
+        Review.objects.create(title=title, author=user, text='Отзыв',
+                              score=9)
+        detail = anon_client.get(f'/api/v1/titles/{title.id}/').json()
+        listed = anon_client.get(list_url).json()['results']
+        assert detail['rating'] == 9, (
+            'Проверьте, что новый отзыв сбрасывает кеш произведения'
+        )
+        assert {item['id']: item['rating'] for item in listed}[title.id] == 9
+
+    def test_review_keeps_pages_of_other_titles_cached(
+            self, titles, user, anon_client, django_assert_num_queries):
+        # Страница 1 - пять последних произведений, страница 2 - первое.
+        anon_client.get('/api/v1/titles/?page=1')
+        anon_client.get('/api/v1/titles/?page=2')
+        Review.objects.create(title=titles[0], author=user, text='Отзыв',
+                              score=9)
+        with django_assert_num_queries(0):
+            anon_client.get('/api/v1/titles/?page=1')
+        second = anon_client.get('/api/v1/titles/?page=2').json()
+        assert second['results'][0]['rating'] == 9, (
+            'Проверьте, что отзыв сбрасывает только страницы со своим '
+            'произведением'
+        )
+        top = anon_client.get('/api/v1/titles/top/').json()
+        assert [item['id'] for item in top['results']] == [titles[0].id], (
+            'Проверьте, что подборки сбрасываются любым отзывом'
+        )
+
+    def test_title_change_keeps_other_details_cached(
+            self, titles, anon_client, django_assert_num_queries):
+        changed, other = titles[0], titles[1]
+        anon_client.get(f'/api/v1/titles/{other.id}/')
+        changed.name = 'Новое название'
+        changed.save()
+        with django_assert_num_queries(0):
+            anon_client.get(f'/api/v1/titles/{other.id}/')
+        response = anon_client.get(f'/api/v1/titles/{changed.id}/')
+        assert response.json()['name'] == 'Новое название'
+
+    def test_genre_change_does_not_touch_categories(
+            self, categories, genres, anon_client,
+            django_assert_num_queries):
+        anon_client.get('/api/v1/categories/')
+        anon_client.get('/api/v1/genres/')
+        Genre.objects.create(name='Ужасы', slug='horror')
+        with django_assert_num_queries(0):
+            anon_client.get('/api/v1/categories/')
+        genres_page = anon_client.get('/api/v1/genres/').json()
+        assert genres_page['count'] == len(genres) + 1
+        Categories.objects.filter(slug='book').delete()
+        assert anon_client.get('/api/v1/categories/').json()['count'] == 1
+
+    def test_authenticated_requests_bypass_cache(
+            self, titles, user_client, django_assert_num_queries):
+        user_client.get('/api/v1/titles/')
+        with django_assert_num_queries(10, exact=False) as context:
+            user_client.get('/api/v1/titles/')
+        assert context.captured_queries, (
+            'Проверьте, что ответы авторизованным пользователям не кешируются'
+        )
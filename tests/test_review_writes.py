@@ -0,0 +1,85 @@
+import pytest
+
+from reviews.models import Comment, Review
+
+# Произведение, INSERT отзыва и UPDATE рейтинга; SAVEPOINT и RELEASE
+# добавляет транзакция теста вокруг atomic.
+REVIEW_CREATE_QUERIES = 5
+# Отзыв из URL, INSERT комментария и UPDATE числа комментариев в одной
+# транзакции (SAVEPOINT и RELEASE).
+COMMENT_CREATE_QUERIES = 5
+# Объект вместе с автором, без отдельного запроса родителя.
+DETAIL_QUERIES = 1
+
+
+@pytest.mark.django_db
+class TestReviewWrites:
+
+    def test_review_create_queries(self, title, user_client,
+                                   django_assert_num_queries):
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        with django_assert_num_queries(REVIEW_CREATE_QUERIES):
+            response = user_client.post(url, data={'text': 'Отзыв',
+                                                   'score': 6})
+        assert response.status_code == 201
+
+    def test_duplicate_review_rejected_by_constraint(self, title, user,
+                                                     user_client):
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        user_client.post(url, data={'text': 'Отзыв', 'score': 6})
+        response = user_client.post(url, data={'text': 'Ещё', 'score': 2})
+        assert response.status_code == 400
+        assert response.json() == {'non_field_errors': [
+            'Вы уже оставили свой отзыв к данному произведению'
+        ]}, 'Проверьте, что повторный отзыв получает прежний ответ 400'
+        title.refresh_from_db()
+        assert (title.rating_sum, title.reviews_count) == (6, 1), (
+            'Проверьте, что отклонённый отзыв не меняет рейтинг'
+        )
+
+    def test_review_of_missing_title(self, user_client):
+        url = '/api/v1/titles/99999/reviews/'
+        response = user_client.post(url, data={'text': 'Отзыв', 'score': 6})
+        assert response.status_code == 404
+        assert user_client.get(url).status_code == 404
+
+    def test_review_detail_queries(self, titles, reviews, user_client,
+                                   django_assert_num_queries):
+        url = f'/api/v1/titles/{titles[0].id}/reviews/{reviews[0].id}/'
+        with django_assert_num_queries(DETAIL_QUERIES):
+            assert user_client.get(url).status_code == 200
+        other = f'/api/v1/titles/{titles[1].id}/reviews/{reviews[0].id}/'
+        assert user_client.get(other).status_code == 404, (
+            'Проверьте, что отзыв не находится по чужому произведению'
+        )
+
+    def test_review_update_keeps_title(self, title, reviews, admin_client):
+        url = f'/api/v1/titles/{title.id}/reviews/{reviews[0].id}/'
+        response = admin_client.patch(url, data={'score': 5})
+        assert response.status_code == 200
+        assert Review.objects.get(pk=reviews[0].pk).title_id == title.id
+
+
+@pytest.mark.django_db
+class TestCommentWrites:
+
+    def test_comment_create_queries(self, title, reviews, user_client,
+                                    django_assert_num_queries):
+        url = f'/api/v1/titles/{title.id}/reviews/{reviews[0].id}/comments/'
+        with django_assert_num_queries(COMMENT_CREATE_QUERIES):
+            response = user_client.post(url, data={'text': 'Комментарий'})
+        assert response.status_code == 201
+
+    def test_comment_detail_queries(self, titles, reviews, user,
+                                    user_client, django_assert_num_queries):
+        comment = Comment.objects.create(review=reviews[0], author=user,
+                                         text='Комментарий')
+        url = (f'/api/v1/titles/{titles[0].id}/reviews/{reviews[0].id}'
+               f'/comments/{comment.id}/')
+        with django_assert_num_queries(DETAIL_QUERIES):
+            assert user_client.get(url).status_code == 200
+        other = (f'/api/v1/titles/{titles[1].id}/reviews/{reviews[0].id}'
+                 f'/comments/{comment.id}/')
+        assert user_client.get(other).status_code == 404, (
+            'Проверьте, что комментарий не находится по чужому произведению'
+        )
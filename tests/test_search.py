@@ -0,0 +1,55 @@
+import pytest
+
+from reviews.models import Title
+
+
+@pytest.fixture
+def catalogue(db):
+    names = ('Властелин колец', 'Властелин времени', 'Колец не бывает',
+             'Война и мир', 'Мир Дикого Запада')
+    return [Title.objects.create(id=200 + index, name=name, year=2000)
+            for index, name in enumerate(names)]
+
+
+def names(response):
+    return [item['name'] for item in response.json()['results']]
+
+
+@pytest.mark.django_db
+class TestTitleSearch:
+
+    def test_prefix_search_finds_words(self, catalogue, anon_client):
+        response = anon_client.get('/api/v1/titles/?search=влас')
+        assert sorted(names(response)) == [
+            'Властелин времени', 'Властелин колец'
+        ], 'Проверьте поиск произведений по началу слова'
+
+    def test_all_words_must_match(self, catalogue, anon_client):
+        response = anon_client.get('/api/v1/titles/?search=властелин кол')
+        assert names(response) == ['Властелин колец']
+
+    def test_results_are_ranked(self, catalogue, anon_client):
+        response = anon_client.get('/api/v1/titles/?search=мир')
+        assert names(response)[0] == 'Война и мир', (
+            'Проверьте, что более короткое совпадение идёт выше'
+        )
+
+    def test_index_follows_title_changes(self, catalogue, anon_client):
+        title = catalogue[3]
+        title.name = 'Анна Каренина'
+        title.save()
+        assert names(anon_client.get('/api/v1/titles/?search=мир')) == [
+            'Мир Дикого Запада'
+        ]
+        assert names(anon_client.get('/api/v1/titles/?search=карен')) == [
+            'Анна Каренина'
+        ]
+        title.delete()
+        assert names(anon_client.get('/api/v1/titles/?search=анна')) == []
+
+    def test_search_combines_with_filters(self, catalogue, titles,
+                                          anon_client):
+        response = anon_client.get(
+            '/api/v1/titles/?search=произведение&year=1991'
+        )
+        assert names(response) == ['Произведение 1']
@@ -0,0 +1,78 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def run(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    return response, [query['sql'] for query in queries.captured_queries]
+
+
+@pytest.mark.django_db
+class TestSparseFields:
+
+    def test_title_fields_skip_relations(self, titles, user_client):
+        response, queries = run(user_client, '/api/v1/titles/?fields=id,name')
+        assert response.status_code == 200
+        results = response.json()['results']
+        assert results and all(set(item) == {'id', 'name'}
+                               for item in results), (
+            'Проверьте, что ?fields= оставляет только указанные поля'
+        )
+        assert len(queries) == 2, (
+            'Проверьте, что без genre не выполняется prefetch жанров'
+        )
+        assert 'reviews_categories' not in queries[-1]
+        assert '"description"' not in queries[-1], (
+            'Проверьте, что читаются только нужные колонки'
+        )
+
+    def test_title_omit(self, title, user_client):
+        response, queries = run(
+            user_client, f'/api/v1/titles/{title.id}/?omit=genre,description'
+        )
+        assert set(response.json()) == {'id', 'name', 'year', 'category',
+                                         'rating', 'reviews_count'}
+        assert len(queries) == 1
+        assert 'reviews_categories' in queries[0]
+
+    def test_unknown_field(self, titles, user_client):
+        response = user_client.get('/api/v1/titles/?fields=id,votes')
+        assert response.status_code == 400
+        assert 'votes' in response.json()['fields']
+
+    def test_review_fields(self, title, reviews, user_client):
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        response, queries = run(user_client, f'{url}?fields=id,score')
+        assert [set(item) for item in response.json()['results']] == [
+            {'id', 'score'}
+        ] * len(reviews)
+        assert 'users_customuser' not in queries[-1], (
+            'Проверьте, что автор не подгружается, если его нет в полях'
+        )
+        response = user_client.get(f'{url}?fields=author')
+        assert [item['author'] for item in response.json()['results']] == [
+            review.author.username for review in reviews
+        ]
+
+    def test_comment_and_user_fields(self, title, reviews, admin,
+                                     admin_client):
+        review = reviews[0]
+        url = f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/'
+        admin_client.post(url, data={'text': 'Комментарий'})
+        response = admin_client.get(f'{url}?omit=pub_date,id')
+        assert response.json()['results'] == [
+            {'text': 'Комментарий', 'author': admin.username}
+        ]
+        response = admin_client.get('/api/v1/users/?fields=username,role')
+        assert all(set(item) == {'username', 'role'}
+                   for item in response.json()['results'])
+
+    def test_writes_ignore_fields(self, title, user_client):
+        response = user_client.post(
+            f'/api/v1/titles/{title.id}/reviews/?fields=id',
+            data={'text': 'Отзыв', 'score': 8}
+        )
+        assert response.status_code == 201
+        assert response.json()['score'] == 8
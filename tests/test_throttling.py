@@ -0,0 +1,96 @@
+import pytest
+from rest_framework.test import APIRequestFactory
+
+from api.throttling import PostUserRateThrottle, UserRateThrottle
+
+
+class FakeUser:
+    is_authenticated = True
+    pk = 42
+
+
+def make_request(method='get'):
+    request = getattr(APIRequestFactory(), method)('/')
+    request.user = FakeUser()
+    return request
+
+
+class TestSlidingWindowThrottle:
+
+    def test_limit_is_enforced_and_window_slides(self, monkeypatch):
+        now = [960.0]
+        throttle = UserRateThrottle()
+        monkeypatch.setattr(throttle, 'rate', '3/min')
+        throttle.num_requests, throttle.duration = 3, 60
+        monkeypatch.setattr(throttle, 'timer', lambda: now[0])
+
+        assert all(throttle.allow_request(make_request(), None)
+                   for _ in range(3))
+        assert not throttle.allow_request(make_request(), None), (
+            'Проверьте, что лишний запрос в окне отклоняется'
+        )
+        assert 0 < throttle.wait() <= 60
+
+        now[0] += 60
+        assert not throttle.allow_request(make_request(), None), (
+            'Проверьте, что запросы прошлого окна учитываются с весом'
+        )
+        now[0] += 45
+        assert throttle.allow_request(make_request(), None)
+
+    def test_state_per_key_is_constant(self, monkeypatch):
+        from django.core.cache import cache
+
+        throttle = UserRateThrottle()
+        for _ in range(50):
+            throttle.allow_request(make_request(), None)
+        keys = [key for key in cache._cache if 'throttle_user_42' in key]
+        assert len(keys) == 1, (
+            'Проверьте, что на ключ хранится счётчик, а не история запросов'
+        )
+
+    def test_post_throttle_ignores_safe_methods(self, monkeypatch):
+        monkeypatch.setitem(PostUserRateThrottle.THROTTLE_RATES,
+                            'post_user', '1/min')
+        throttle = PostUserRateThrottle()
+        assert throttle.allow_request(make_request('post'), None)
+        assert not throttle.allow_request(make_request('post'), None)
+        assert throttle.allow_request(make_request('get'), None)
+
+
+@pytest.mark.django_db
+class TestPostUserThrottle:
+
+    def test_review_and_comment_creation_is_limited(self, title, reviews,
+                                                     user_client,
+                                                     monkeypatch):
+        monkeypatch.setitem(PostUserRateThrottle.THROTTLE_RATES,
+                            'post_user', '1/min')
+        review = reviews[0]
+        comments = (f'/api/v1/titles/{title.id}/reviews/{review.id}/'
+                    'comments/')
+        assert user_client.post(comments, data={'text': 'Первый'}
+                                ).status_code == 201
+        response = user_client.post(comments, data={'text': 'Второй'})
+        assert response.status_code == 429, (
+            'Проверьте, что post_user ограничивает создание комментариев'
+        )
+        assert user_client.get(comments).status_code == 200
+
+    def test_default_limits_still_apply(self, title, reviews, user_client,
+                                        anon_client, monkeypatch):
+        from django.core.cache import cache
+
+        monkeypatch.setitem(UserRateThrottle.THROTTLE_RATES, 'user', '2/min')
+        monkeypatch.setitem(UserRateThrottle.THROTTLE_RATES, 'anon', '2/min')
+        urls = (f'/api/v1/titles/{title.id}/reviews/',
+                f'/api/v1/titles/{title.id}/reviews/{reviews[0].id}/'
+                'comments/')
+        for url in urls:
+            for client in (user_client, anon_client):
+                statuses = [client.get(url).status_code for _ in range(3)]
+                assert statuses == [200, 200, 429], (
+                    'Проверьте, что отзывы и комментарии ограничены общими '
+                    'лимитами user и anon'
+                )
+                cache.clear()
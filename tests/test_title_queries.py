@@ -0,0 +1,58 @@
+import pytest
+
+from reviews.models import Title
+
+# COUNT для пагинации, страница произведений и связи с жанрами страницы;
+# жанры и категории берутся из копий справочников в памяти.
+LIST_QUERIES = 3
+# Произведение с категорией и его жанры.
+DETAIL_QUERIES = 2
+
+
+@pytest.mark.django_db
+class TestTitleQueries:
+
+    def test_list_query_count_does_not_grow(self, titles, reviews,
+                                            warm_lookups, anon_client,
+                                            django_assert_num_queries):
+        with django_assert_num_queries(LIST_QUERIES):
+            response = anon_client.get('/api/v1/titles/')
+        assert response.status_code == 200
+        first_page = response.json()['results']
+
+        for index in range(20):
+            title = Title.objects.create(name=f'Новое {index}', year=2000)
+            title.genre.set(titles[-1].genre.all())
+        with django_assert_num_queries(LIST_QUERIES):
+            response = anon_client.get('/api/v1/titles/?page=2')
+        assert response.status_code == 200
+        assert first_page, 'Проверьте, что список произведений не пуст'
+
+    def test_detail_query_count(self, title, reviews, anon_client,
+                                django_assert_num_queries):
+        with django_assert_num_queries(DETAIL_QUERIES):
+            response = anon_client.get(f'/api/v1/titles/{title.id}/')
+        data = response.json()
+        assert data['category'] == {'name': 'Фильм', 'slug': 'movie'}
+        assert data['genre'] == [{'name': 'Драма', 'slug': 'drama'}]
+        assert data['rating'] == pytest.approx(7)
+
+    @pytest.mark.parametrize('query', (
+        'genre=drama',
+        'category=book',
+        'year=1993',
+        'name=Произведение',
+        'genre=comedy&category=movie&year=1994&name=4',
+    ))
+    def test_filtered_list_query_count(self, titles, warm_lookups,
+                                       anon_client, query,
+                                       django_assert_num_queries):
+        with django_assert_num_queries(LIST_QUERIES):
+            response = anon_client.get(f'/api/v1/titles/?{query}')
+        assert response.status_code == 200, (
+            f'Проверьте фильтрацию произведений по запросу `{query}`'
+        )
+        results = response.json()['results']
+        assert results, f'Запрос `{query}` должен находить произведения'
+        for item in results:
+            assert 'genre' in item and 'category' in item